@@ -1,5 +1,8 @@
 import os
 import glob
+import time
+import argparse
+import multiprocessing
 import cv2
 import numpy as np
 import mediapipe as mp
@@ -9,31 +12,99 @@ from tqdm import tqdm
 
 mp_hands = mp.solutions.hands
 
-def extract_keypoints_from_video(video_path, max_frames=30):
+# One Hands graph per pool worker, created by _init_worker
+_worker_hands = None
+
+
+def sample_indices(frame_count, max_frames=30):
+    """Frame indices the extractor keeps: every len//max_frames-th frame, at most max_frames"""
+    step = max(1, frame_count // max_frames)
+    return list(range(0, frame_count, step))[:max_frames]
+
+
+def count_frames(video_path):
+    """Frame count by grabbing every frame, for containers whose header count can't be trusted"""
+    cap = cv2.VideoCapture(video_path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+
+def grab_frames_at(video_path, wanted, frame_count=None):
+    """Decode only the frames at the sorted indices in `wanted`
+
+    Skipped frames are grab()bed and never retrieve()d, so at most len(wanted) frames are
+    held at once. With frame_count, the rest of the video is grabbed too, to check that it
+    has exactly that many frames. Returns the frames and whether the count held. A frame
+    that fails to retrieve() ends the sample, and the rest is zero-padded by the caller.
+    """
     cap = cv2.VideoCapture(video_path)
     frames = []
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frames.append(frame)
+    index = 0
+    try:
+        for target in wanted:
+            while index <= target:
+                if not cap.grab():
+                    return frames, False
+                index += 1
+            ret, frame = cap.retrieve()
+            if not ret:
+                # Like a failed read() in a full decode: the usable video ends here, and
+                # skipping the frame would shift every later one into the wrong slot
+                return frames, True
+            frames.append(frame)
+        if frame_count is not None:
+            while index < frame_count:
+                if not cap.grab():
+                    return frames, False
+                index += 1
+            # One more frame means the count was understated
+            if cap.grab():
+                return frames, False
+    finally:
+        cap.release()
+    return frames, True
+
+
+def read_sampled_frames(video_path, max_frames=30):
+    """The sampled frames of a video, with memory bounded by max_frames rather than its length
+
+    Sampling uses CAP_PROP_FRAME_COUNT, checked by grabbing to the end of the video. When
+    the container doesn't report a count, or the video has fewer or more frames than it
+    says, a first pass counts the frames and the second samples with the real count, so the
+    picks match a full decode.
+    """
+    cap = cv2.VideoCapture(video_path)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     cap.release()
 
+    if frame_count > 0:
+        frames, count_held = grab_frames_at(video_path, sample_indices(frame_count, max_frames), frame_count)
+        if count_held:
+            return frames
+
+    frame_count = count_frames(video_path)
+    frames, _ = grab_frames_at(video_path, sample_indices(frame_count, max_frames))
+    return frames
+
+
+def extract_keypoints_from_video(video_path, max_frames=30, hands=None):
+    if hands is None:
+        with mp_hands.Hands(static_image_mode=True, max_num_hands=1) as hands:
+            return extract_keypoints_from_video(video_path, max_frames, hands)
+
     keypoints = []
-    step = max(1, len(frames) // max_frames)
-
-    with mp_hands.Hands(static_image_mode=True, max_num_hands=1) as hands:
-        for i in range(0, len(frames), step):
-            if len(keypoints) >= max_frames:
-                break
-            image = cv2.cvtColor(frames[i], cv2.COLOR_BGR2RGB)
-            results = hands.process(image)
-            if results.multi_hand_landmarks:
-                lm = results.multi_hand_landmarks[0]
-                kp = [coord for point in lm.landmark for coord in (point.x, point.y)]
-            else:
-                kp = [0.0] * 42
-            keypoints.append(kp)
+    for frame in read_sampled_frames(video_path, max_frames):
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = hands.process(image)
+        if results.multi_hand_landmarks:
+            lm = results.multi_hand_landmarks[0]
+            kp = [coord for point in lm.landmark for coord in (point.x, point.y)]
+        else:
+            kp = [0.0] * 42
+        keypoints.append(kp)
 
     while len(keypoints) < max_frames:
         keypoints.append([0.0] * 42)
@@ -41,7 +112,66 @@ def extract_keypoints_from_video(video_path, max_frames=30):
     return np.array(keypoints)
 
 
-def preprocess_split(split_name, video_root="videos", output_root="preprocessed_keypoints", max_frames=30, limit=None):
+def _init_worker():
+    global _worker_hands
+    _worker_hands = mp_hands.Hands(static_image_mode=True, max_num_hands=1)
+
+
+def _close_worker():
+    global _worker_hands
+    if _worker_hands is not None:
+        _worker_hands.close()
+        _worker_hands = None
+
+
+def _extract_task(task):
+    """Pool job: extract one video and write its .npy atomically"""
+    video_path, output_path, max_frames = task
+    start = time.time()
+    try:
+        keypoints = extract_keypoints_from_video(video_path, max_frames, _worker_hands)
+        tmp_path = output_path + ".tmp.npy"
+        np.save(tmp_path, keypoints)
+        os.replace(tmp_path, output_path)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return {
+        "file": os.path.basename(output_path),
+        "video": video_path,
+        "max_frames": max_frames,
+        "worker": os.getpid(),
+        "seconds": round(time.time() - start, 3),
+        "error": error
+    }
+
+
+def read_manifest(manifest_path):
+    """Latest successful entry per file from earlier runs (a torn last line is ignored)"""
+    done = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not entry.get("error"):
+                    done[entry["file"]] = entry
+    return done
+
+
+def report_throughput(worker_stats, elapsed):
+    print(f"Extracted {sum(s['videos'] for s in worker_stats.values())} videos in {elapsed:.1f}s")
+    for worker, stats in sorted(worker_stats.items()):
+        busy = stats["seconds"]
+        print(f"  worker {worker}: {stats['videos']} videos, {stats['errors']} errors, "
+              f"{stats['videos'] / busy if busy else 0.0:.2f} videos/s while busy, "
+              f"{stats['videos'] / elapsed if elapsed else 0.0:.2f} videos/s overall")
+
+
+def preprocess_split(split_name, video_root="videos", output_root="preprocessed_keypoints", max_frames=30, limit=None,
+                     workers=None):
     input_dir = os.path.join(video_root, split_name)
     output_dir = os.path.join(output_root, split_name)
     os.makedirs(output_dir, exist_ok=True)
@@ -55,7 +185,12 @@ def preprocess_split(split_name, video_root="videos", output_root="preprocessed_
     if limit:
         all_videos = all_videos[:limit]
 
-    for video_path in tqdm(all_videos, desc=f"Processing {split_name}"):
+    # Completed videos are appended to the manifest as they finish, so a stopped run resumes
+    manifest_path = os.path.join(output_dir, "manifest.jsonl")
+    done = read_manifest(manifest_path)
+    tasks = []
+
+    for video_path in all_videos:
         class_label = os.path.basename(os.path.dirname(video_path)).lower()
         file_name = os.path.splitext(os.path.basename(video_path))[0]
         output_path = os.path.join(output_dir, f"{file_name}.npy")
@@ -64,17 +199,63 @@ def preprocess_split(split_name, video_root="videos", output_root="preprocessed_
             label_map[class_label] = label_id
             label_id += 1
 
-        if os.path.exists(output_path):
-            print(f"Skipping (already exists): {file_name}.npy")
-        else:
-            print(f"Processing: {file_name} (class: {class_label})")
-            keypoints = extract_keypoints_from_video(video_path, max_frames=max_frames)
-            np.save(output_path, keypoints)
-            print(f"Saved {file_name}.npy")
+        # .npy files are written atomically, so one that exists is complete; redo it only if
+        # the manifest says it was extracted with a different max_frames
+        entry = done.get(f"{file_name}.npy")
+        if not os.path.exists(output_path) or (entry is not None and entry.get("max_frames") != max_frames):
+            tasks.append((video_path, output_path, max_frames))
 
         data.append(f"{file_name}.npy")
         labels.append(label_map[class_label])
 
+    print(f"{split_name}: {len(all_videos)} videos, {len(all_videos) - len(tasks)} already done, {len(tasks)} to extract")
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tasks)))
+    worker_stats = {}
+    failed = set()
+    start = time.time()
+
+    if tasks:
+        with open(manifest_path, "a") as manifest:
+            if workers > 1:
+                pool = multiprocessing.Pool(workers, initializer=_init_worker)
+                results = pool.imap_unordered(_extract_task, tasks)
+            else:
+                pool = None
+                _init_worker()
+                results = map(_extract_task, tasks)
+            try:
+                for result in tqdm(results, total=len(tasks), desc=f"Processing {split_name}"):
+                    stats = worker_stats.setdefault(result["worker"], {"videos": 0, "errors": 0, "seconds": 0.0})
+                    stats["seconds"] += result["seconds"]
+                    if result["error"]:
+                        stats["errors"] += 1
+                        failed.add(result["file"])
+                        print(f"Failed: {result['video']}: {result['error']}")
+                    else:
+                        stats["videos"] += 1
+                    manifest.write(json.dumps(result) + "\n")
+                    manifest.flush()
+            except BaseException:
+                # Ctrl-C or a failed write: stop now rather than drain the queue; the
+                # manifest already has every finished video, so a rerun picks up from here
+                if pool is not None:
+                    pool.terminate()
+                    pool.join()
+                raise
+            else:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            finally:
+                if pool is None:
+                    _close_worker()
+        report_throughput(worker_stats, time.time() - start)
+
+    if failed:
+        # Leave failed videos out of labels.csv; the next run retries them
+        kept = [(fname, lbl) for fname, lbl in zip(data, labels) if fname not in failed]
+        data, labels = [fname for fname, _ in kept], [lbl for _, lbl in kept]
+
     # Save per-split labels.csv and label_map.json
     if data:
         with open(os.path.join(output_dir, "labels.csv"), "w") as f:
@@ -127,14 +308,23 @@ def merge_labels_and_maps(processed_splits, output_root="preprocessed_keypoints"
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract MediaPipe hand keypoints from the split videos")
+    parser.add_argument("--video-root", default="videos")
+    parser.add_argument("--output-root", default="preprocessed_keypoints")
+    parser.add_argument("--max-frames", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    args = parser.parse_args()
+
     processed_splits = []
     for split in ["train", "val", "test"]:
         split_dir, data, labels, label_map = preprocess_split(
             split_name=split,
-            video_root="videos",
-            output_root="preprocessed_keypoints",
-            max_frames=30,
-            limit=None
+            video_root=args.video_root,
+            output_root=args.output_root,
+            max_frames=args.max_frames,
+            limit=args.limit,
+            workers=args.workers
         )
         processed_splits.append((split, split_dir, data, labels, label_map))
 
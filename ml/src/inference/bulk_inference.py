@@ -0,0 +1,397 @@
+"""Offline bulk inference over image directories and video files.
+
+Frames stream through three stages connected by bounded queues:
+
+    decode workers (prefetch) -> batched YOLOSignDetector.predict_batch -> writer
+
+Results go to JSONL or Parquet. Progress is checkpointed per source (an image file
+or a whole video) next to the output, so an interrupted job resumes where it
+stopped: anything written after the last checkpoint is discarded and redone.
+
+Example:
+    python -m ml.src.inference.bulk_inference \
+        --model ml/saved_models/yolo/best.pt \
+        --class-names ml/saved_models/yolo/class_names.json \
+        --output scores.jsonl data/videos/test
+"""
+import os
+import glob
+import json
+import time
+import queue
+import argparse
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..models.yolo_detector import YOLOSignDetector
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+
+
+class SourceDone:
+    """Queue marker: every frame of a source has been queued ahead of it"""
+
+    def __init__(self, source: str, num_frames: int, error: Optional[str] = None):
+        self.source = source
+        self.num_frames = num_frames
+        self.error = error
+
+
+def find_sources(inputs: List[str]) -> List[str]:
+    """Expand files and directories into a sorted list of image and video paths"""
+    sources = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for file_path in glob.glob(os.path.join(path, '**', '*'), recursive=True):
+                if os.path.splitext(file_path)[1].lower() in IMAGE_EXTENSIONS | VIDEO_EXTENSIONS:
+                    sources.append(file_path)
+        elif os.path.isfile(path):
+            sources.append(path)
+        else:
+            raise FileNotFoundError(f"Input not found: {path}")
+    return sorted(set(sources))
+
+
+def iter_frames(source: str, video_stride: int = 1) -> Iterator[Tuple[int, Optional[float], np.ndarray]]:
+    """Yield (frame_index, timestamp_seconds, BGR frame) for an image or video"""
+    if os.path.splitext(source)[1].lower() in IMAGE_EXTENSIONS:
+        frame = cv2.imread(source)
+        if frame is None:
+            raise ValueError(f"Could not decode image: {source}")
+        yield 0, None, frame
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {source}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    try:
+        index = 0
+        while True:
+            # grab() skips the decode of frames the stride drops
+            if not cap.grab():
+                break
+            if index % video_stride == 0:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                yield index, (index / fps if fps else None), frame
+            index += 1
+    finally:
+        cap.release()
+
+
+class Checkpoint:
+    """Completed sources plus how much output they account for, saved atomically"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed = set()
+        self.output_offset = 0
+        self.parquet_parts = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                state = json.load(f)
+            self.completed = set(state.get('completed_sources', []))
+            self.output_offset = state.get('output_offset', 0)
+            self.parquet_parts = state.get('parquet_parts', [])
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'completed_sources': sorted(self.completed),
+                'output_offset': self.output_offset,
+                'parquet_parts': self.parquet_parts,
+                'updated_at': time.time()
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+class JsonlWriter:
+    """Appends records as JSON lines, truncating uncheckpointed output on resume"""
+
+    def __init__(self, output_path: str, checkpoint: Checkpoint):
+        self.file = open(output_path, 'ab')
+        self.file.truncate(checkpoint.output_offset)
+        self.file.seek(checkpoint.output_offset)
+
+    def write(self, records: List[Dict[str, Any]]):
+        if records:
+            self.file.write(b''.join(json.dumps(r).encode('utf-8') + b'\n' for r in records))
+
+    def commit(self, checkpoint: Checkpoint):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        checkpoint.output_offset = self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Writes records as part files under a directory; each checkpoint seals a part"""
+
+    def __init__(self, output_dir: str, checkpoint: Checkpoint):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow; pip install pyarrow")
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        # Parts written after the last checkpoint are incomplete; drop them
+        for part in glob.glob(os.path.join(output_dir, 'part-*.parquet')):
+            if os.path.basename(part) not in checkpoint.parquet_parts:
+                os.remove(part)
+        self.part_index = len(checkpoint.parquet_parts)
+        self.buffer = []
+
+    def write(self, records: List[Dict[str, Any]]):
+        self.buffer.extend(records)
+
+    def commit(self, checkpoint: Checkpoint):
+        if not self.buffer:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        name = f'part-{self.part_index:05d}.parquet'
+        pq.write_table(pa.Table.from_pylist(self.buffer), os.path.join(self.output_dir, name))
+        checkpoint.parquet_parts.append(name)
+        self.part_index += 1
+        self.buffer = []
+
+    def close(self):
+        pass
+
+
+class BulkInferenceJob:
+    """Prefetching decode -> batched inference -> writer pipeline over many sources"""
+
+    def __init__(self, detector: YOLOSignDetector, output_path: str, output_format: str = 'jsonl',
+                 batch_size: int = 16, img_size: int = 640, confidence_threshold: float = 0.25,
+                 decode_workers: int = 2, prefetch: int = 64, video_stride: int = 1,
+                 checkpoint_every: int = 50, report_every: float = 10.0):
+        self.detector = detector
+        self.output_path = output_path
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.img_size = img_size
+        self.confidence_threshold = confidence_threshold
+        self.decode_workers = max(1, decode_workers)
+        self.video_stride = max(1, video_stride)
+        self.checkpoint_every = checkpoint_every
+        self.report_every = report_every
+
+        self.checkpoint = Checkpoint(output_path.rstrip('/') + '.checkpoint.json')
+        self.frame_queue = queue.Queue(maxsize=prefetch)
+        self.result_queue = queue.Queue(maxsize=8)
+        self.stats = {'frames': 0, 'sources': 0, 'failed_sources': 0,
+                      'decode_wait': 0.0, 'inference': 0.0, 'write': 0.0}
+        self._stop = threading.Event()
+
+    def _decode_worker(self, sources: 'queue.Queue'):
+        while not self._stop.is_set():
+            try:
+                source = sources.get_nowait()
+            except queue.Empty:
+                return
+            num_frames = 0
+            error = None
+            try:
+                for frame_index, timestamp, frame in iter_frames(source, self.video_stride):
+                    if not self._put((source, frame_index, timestamp, frame)):
+                        return
+                    num_frames += 1
+            except Exception as e:
+                error = str(e)
+            if not self._put(SourceDone(source, num_frames, error)):
+                return
+
+    def _put(self, item) -> bool:
+        """Queue a decoded item, giving up once the job is stopping"""
+        while not self._stop.is_set():
+            try:
+                self.frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _writer(self):
+        if self.output_format == 'parquet':
+            writer = ParquetWriter(self.output_path, self.checkpoint)
+        else:
+            writer = JsonlWriter(self.output_path, self.checkpoint)
+
+        # Records are held per source and written once the source is complete, so the
+        # output never contains part of a source the checkpoint doesn't cover
+        pending_records = {}
+        pending_done = 0
+        try:
+            while True:
+                item = self.result_queue.get()
+                if item is None:
+                    break
+                records, markers = item
+                start = time.perf_counter()
+                for record in records:
+                    pending_records.setdefault(record['source'], []).append(record)
+                for marker in markers:
+                    if marker.error:
+                        self.stats['failed_sources'] += 1
+                        print(f"⚠️  {marker.source}: {marker.error}")
+                    writer.write(pending_records.pop(marker.source, []))
+                    self.checkpoint.completed.add(marker.source)
+                    self.stats['sources'] += 1
+                    pending_done += 1
+                if pending_done >= self.checkpoint_every:
+                    writer.commit(self.checkpoint)
+                    self.checkpoint.save()
+                    pending_done = 0
+                self.stats['write'] += time.perf_counter() - start
+            writer.commit(self.checkpoint)
+            self.checkpoint.save()
+        finally:
+            writer.close()
+
+    def _infer(self, frames: List[tuple]) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        batch_detections = self.detector.predict_batch(
+            [frame for _, _, _, frame in frames], self.confidence_threshold, self.img_size
+        )
+        self.stats['inference'] += time.perf_counter() - start
+
+        records = []
+        for (source, frame_index, timestamp, _), detections in zip(frames, batch_detections):
+            top = detections[0] if detections else None
+            records.append({
+                'source': source,
+                'frame': frame_index,
+                'timestamp': timestamp,
+                'predicted_class': top['class'] if top else 'no_detection',
+                'confidence': top['confidence'] if top else 0.0,
+                'num_detections': len(detections),
+                'detections': detections
+            })
+        self.stats['frames'] += len(records)
+        return records
+
+    def _report(self, start_time: float, final: bool = False):
+        elapsed = time.time() - start_time
+        fps = self.stats['frames'] / elapsed if elapsed > 0 else 0.0
+        prefix = "✅ Done:" if final else "⏱️ "
+        print(f"{prefix} {self.stats['frames']} frames from {self.stats['sources']} sources "
+              f"in {elapsed:.1f}s ({fps:.1f} fps) | inference {self.stats['inference']:.1f}s, "
+              f"waiting on decode {self.stats['decode_wait']:.1f}s, write {self.stats['write']:.1f}s")
+
+    def run(self, sources: List[str]) -> Dict[str, Any]:
+        """Process every source not already in the checkpoint"""
+        todo = [source for source in sources if source not in self.checkpoint.completed]
+        print(f"📂 {len(sources)} sources, {len(sources) - len(todo)} already done, {len(todo)} to process")
+
+        source_queue = queue.Queue()
+        for source in todo:
+            source_queue.put(source)
+        workers = [
+            threading.Thread(target=self._decode_worker, args=(source_queue,), daemon=True)
+            for _ in range(min(self.decode_workers, max(1, len(todo))))
+        ]
+        writer = threading.Thread(target=self._writer, daemon=True)
+        for thread in workers + [writer]:
+            thread.start()
+
+        start_time = time.time()
+        last_report = start_time
+        remaining = len(todo)
+        frames, markers = [], []
+        try:
+            while remaining > 0:
+                wait_start = time.perf_counter()
+                try:
+                    # Don't hold a partial batch hostage to a slow decoder
+                    item = self.frame_queue.get(timeout=0.05 if frames else None)
+                except queue.Empty:
+                    item = None
+                self.stats['decode_wait'] += time.perf_counter() - wait_start
+
+                if isinstance(item, SourceDone):
+                    markers.append(item)
+                    remaining -= 1
+                elif item is not None:
+                    frames.append(item)
+
+                # Markers ride with the batch holding their last frames, so a source
+                # is only checkpointed once all of its records are written
+                if len(frames) >= self.batch_size or (item is None and frames) or remaining == 0:
+                    records = self._infer(frames) if frames else []
+                    self.result_queue.put((records, markers))
+                    frames, markers = [], []
+                elif markers and not frames:
+                    self.result_queue.put(([], markers))
+                    markers = []
+
+                if time.time() - last_report >= self.report_every:
+                    self._report(start_time)
+                    last_report = time.time()
+        finally:
+            self._stop.set()
+            self.result_queue.put(None)
+            writer.join()
+            for thread in workers:
+                thread.join()
+
+        self._report(start_time, final=True)
+        elapsed = time.time() - start_time
+        return {**self.stats, 'elapsed': elapsed,
+                'fps': self.stats['frames'] / elapsed if elapsed > 0 else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk YOLO sign inference over images and videos")
+    parser.add_argument('inputs', nargs='+', help="Image/video files or directories (searched recursively)")
+    parser.add_argument('--model', required=True, help="YOLO weights (.pt, .onnx or OpenVINO dir)")
+    parser.add_argument('--class-names', required=True, help="class_names.json")
+    parser.add_argument('--output', required=True, help="Output .jsonl file or Parquet directory")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default=None,
+                        help="Output format (default: from the output path)")
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--img-size', type=int, default=640)
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--decode-workers', type=int, default=2)
+    parser.add_argument('--prefetch', type=int, default=64, help="Max decoded frames waiting for inference")
+    parser.add_argument('--video-stride', type=int, default=1, help="Score every Nth video frame")
+    parser.add_argument('--checkpoint-every', type=int, default=50, help="Sources per checkpoint")
+    parser.add_argument('--fresh', action='store_true', help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+
+    output_format = args.format or ('jsonl' if args.output.endswith('.jsonl') else 'parquet')
+    checkpoint_path = args.output.rstrip('/') + '.checkpoint.json'
+    if args.fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    detector = YOLOSignDetector()
+    detector.load_model(args.model, args.class_names)
+
+    job = BulkInferenceJob(
+        detector,
+        args.output,
+        output_format=output_format,
+        batch_size=args.batch_size,
+        img_size=args.img_size,
+        confidence_threshold=args.conf,
+        decode_workers=args.decode_workers,
+        prefetch=args.prefetch,
+        video_stride=args.video_stride,
+        checkpoint_every=args.checkpoint_every
+    )
+    job.run(find_sources(args.inputs))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
 from .asl_tcn import ASLTCN
-from .asl_lstm import ASLLSTM
+from .asl_lstm import ASLLSTM, LSTMSessionStates
 
-__all__ = ['ASLTCN', 'ASLLSTM']
\ No newline at end of file
+__all__ = ['ASLTCN', 'ASLLSTM', 'LSTMSessionStates']
\ No newline at end of file
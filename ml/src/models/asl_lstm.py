@@ -1,3 +1,5 @@
+import threading
+import torch
 import torch.nn as nn
 
 class ASLLSTM(nn.Module):
@@ -11,3 +13,76 @@ class ASLLSTM(nn.Module):
         out = out[:, -1, :]  # take last time step
         out = self.fc(out)
         return out
+
+    def init_state(self, batch_size=1):
+        """Zero (h, c), each (num_layers, batch, hidden), for `batch_size` new streams"""
+        shape = (self.lstm.num_layers, batch_size, self.lstm.hidden_size)
+        return self.fc.weight.new_zeros(shape), self.fc.weight.new_zeros(shape)
+
+    def step(self, frame, state=None):  # frame: (batch, 42)
+        """One frame through the LSTM: logits plus the new (h, c) to pass to the next call"""
+        out, state = self.lstm(frame.unsqueeze(1), state)
+        return self.fc(out[:, -1, :]), state
+
+
+class LSTMSessionStates:
+    """(h, c) of many live streams packed into one tensor pair, so one step advances them all
+
+    Each session owns a column of the packed state; columns of removed sessions are reused
+    and the pack doubles when it runs out.
+    """
+
+    def __init__(self, model, capacity=16):
+        self.model = model.eval()
+        self.h, self.c = model.init_state(capacity)
+        self.slots = {}  # session_id -> column in h/c
+        self.free = list(range(capacity - 1, -1, -1))
+        self.lock = threading.Lock()
+
+    def _slot(self, session_id):
+        slot = self.slots.get(session_id)
+        if slot is None:
+            if not self.free:
+                self._grow()
+            slot = self.free.pop()
+            self.h[:, slot].zero_()
+            self.c[:, slot].zero_()
+            self.slots[session_id] = slot
+        return slot
+
+    def _grow(self):
+        capacity = self.h.shape[1]
+        h, c = self.model.init_state(capacity)
+        self.h = torch.cat([self.h, h], dim=1)
+        self.c = torch.cat([self.c, c], dim=1)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    @torch.no_grad()
+    def step(self, session_ids, frames):
+        """Advance distinct sessions by one frame each ((batch, 42) tensor); returns their logits"""
+        with self.lock:
+            index = torch.tensor([self._slot(session_id) for session_id in session_ids])
+            state = (self.h.index_select(1, index), self.c.index_select(1, index))
+            logits, (h, c) = self.model.step(frames, state)
+            self.h[:, index] = h
+            self.c[:, index] = c
+        return logits
+
+    def reset(self, session_id):
+        """Start the session over from a zero state"""
+        with self.lock:
+            slot = self.slots.get(session_id)
+            if slot is not None:
+                self.h[:, slot].zero_()
+                self.c[:, slot].zero_()
+
+    def remove(self, session_id):
+        """Drop an ended or evicted session and free its column"""
+        with self.lock:
+            slot = self.slots.pop(session_id, None)
+            if slot is not None:
+                self.free.append(slot)
+        return slot is not None
+
+    def __len__(self):
+        return len(self.slots)
@@ -26,3 +26,200 @@ class ASLTCN(nn.Module):
         x = self.global_pool(x).squeeze(-1)
         x = self.dropout(x)
         return self.fc(x)
+
+    def streaming(self, window=30):
+        """Incremental inference over a sliding window (eval mode, BatchNorm folded)"""
+        return StreamingTCN(self, window)
+
+
+def fold_batchnorm(conv, bn):
+    """Conv1d weight/bias with an eval-mode BatchNorm1d folded in"""
+    scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+    bias = conv.bias if conv.bias is not None else torch.zeros_like(bn.running_mean)
+    weight = conv.weight * scale[:, None, None]
+    return weight, (bias - bn.running_mean) * scale + bn.bias
+
+
+class TCNStreamState:
+    """Per-session caches for StreamingTCN: the last `window` frames and layer activations"""
+
+    def __init__(self, window, input_channels, num_filters):
+        self.frames = torch.zeros(window, input_channels)
+        # u[n]: layer-1 output at frame n with real neighbours on both sides
+        self.h1 = torch.zeros(window, num_filters)
+        # v[n]: layer-2 output at frame n computed from u[n-1], u[n], u[n+1]
+        self.h2 = torch.zeros(window, num_filters)
+        # Running sum of v over the window interior, in float64 so it doesn't drift
+        self.pool_sum = torch.zeros(num_filters, dtype=torch.float64)
+        self.count = 0
+
+    def reset(self):
+        self.frames.zero_()
+        self.h1.zero_()
+        self.h2.zero_()
+        self.pool_sum.zero_()
+        self.count = 0
+
+
+class StreamingTCN:
+    """ASLTCN sliding-window inference with O(1) layer work per new frame
+
+    Both convolutions are kernel 3 with zero padding, so inside a window only the
+    two edge positions of layer 1 and four of layer 2 see the padding. Every other
+    activation depends on frames alone and is computed once, when the frame after it
+    arrives. Each window is then the cached interior sum plus the edge terms,
+    averaged and passed through fc, which matches ASLTCN.forward in eval mode.
+    Windows that aren't full yet (zero frames at the end) run the folded batch path.
+    """
+
+    def __init__(self, model, window=30):
+        if model.conv1.kernel_size[0] != 3 or model.conv2.kernel_size[0] != 3:
+            raise ValueError("StreamingTCN supports kernel_size=3 only")
+        if window < 5:
+            raise ValueError("StreamingTCN needs a window of at least 5 frames")
+
+        self.window = window
+        with torch.no_grad():
+            w1, b1 = fold_batchnorm(model.conv1, model.bn1)
+            w2, b2 = fold_batchnorm(model.conv2, model.bn2)
+            self.w1, self.b1, self.w2, self.b2 = w1.clone(), b1.clone(), w2.clone(), b2.clone()
+            # Taps side by side so one matmul applies the kernel to [left, centre, right]
+            self.w1_taps = torch.cat([w1[:, :, 0], w1[:, :, 1], w1[:, :, 2]], dim=1).t().contiguous()
+            self.w2_taps = torch.cat([w2[:, :, 0], w2[:, :, 1], w2[:, :, 2]], dim=1).t().contiguous()
+            self.fc_weight = model.fc.weight.detach().t().contiguous()
+            self.fc_bias = model.fc.bias.detach().clone()
+        self.input_channels = self.w1.shape[1]
+        self.num_filters = self.w1.shape[0]
+
+    def init_state(self):
+        return TCNStreamState(self.window, self.input_channels, self.num_filters)
+
+    def _layer1(self, left, centre, right):
+        return torch.relu(torch.cat([left, centre, right], dim=1) @ self.w1_taps + self.b1)
+
+    def _layer2(self, left, centre, right):
+        return torch.relu(torch.cat([left, centre, right], dim=1) @ self.w2_taps + self.b2)
+
+    def forward_windows(self, windows):
+        """Folded batch forward over (batch, window, channels) windows"""
+        x = windows.permute(0, 2, 1)
+        x = torch.relu(nn.functional.conv1d(x, self.w1, self.b1, padding=1))
+        x = torch.relu(nn.functional.conv1d(x, self.w2, self.b2, padding=1))
+        return x.mean(dim=2) @ self.fc_weight + self.fc_bias
+
+    @torch.no_grad()
+    def step(self, states, frames):
+        """Push one frame per state ((batch, channels) tensor) and update the caches"""
+        T = self.window
+        frames = frames.to(self.w1.dtype)
+        for state, frame in zip(states, frames):
+            state.frames[state.count % T] = frame
+            state.count += 1
+
+        # u[n-1] once frame n is in (n = count - 1)
+        ready = [state for state in states if state.count >= 3]
+        if ready:
+            n = torch.tensor([state.count - 1 for state in ready])
+            u = self._layer1(
+                torch.stack([s.frames[(k - 2) % T] for s, k in zip(ready, n.tolist())]),
+                torch.stack([s.frames[(k - 1) % T] for s, k in zip(ready, n.tolist())]),
+                torch.stack([s.frames[k % T] for s, k in zip(ready, n.tolist())])
+            )
+            for state, k, value in zip(ready, n.tolist(), u):
+                state.h1[(k - 1) % T] = value
+
+        # v[n-2] once u[n-1] is in; u starts at index 1, so v starts at index 2
+        ready = [state for state in states if state.count >= 5]
+        if ready:
+            n = [state.count - 1 for state in ready]
+            v = self._layer2(
+                torch.stack([s.h1[(k - 3) % T] for s, k in zip(ready, n)]),
+                torch.stack([s.h1[(k - 2) % T] for s, k in zip(ready, n)]),
+                torch.stack([s.h1[(k - 1) % T] for s, k in zip(ready, n)])
+            )
+            for state, k, value in zip(ready, n, v):
+                state.h2[(k - 2) % T] = value
+
+        # Slide the interior sum to the window ending at n: v over [n-T+3, n-2]
+        for state in states:
+            k = state.count - 1
+            if k - 2 >= 2:
+                state.pool_sum += state.h2[(k - 2) % T].double()
+            if k - T + 2 >= 2:
+                state.pool_sum -= state.h2[(k - T + 2) % T].double()
+
+    @torch.no_grad()
+    def readout(self, states):
+        """Logits for each state's current window, (batch, num_classes)"""
+        T = self.window
+        logits = torch.empty(len(states), self.fc_bias.shape[0])
+
+        full = [i for i, state in enumerate(states) if state.count >= T]
+        partial = [i for i, state in enumerate(states) if state.count < T]
+
+        if partial:
+            # Short streams are zero-padded at the end; the padding isn't cached, so run the window
+            logits[partial] = self.forward_windows(torch.stack([states[i].frames for i in partial]))
+
+        if full:
+            group = [states[i] for i in full]
+            ends = [state.count - 1 for state in group]
+            starts = [n - T + 1 for n in ends]
+            frames = lambda offsets: torch.stack([s.frames[k % T] for s, k in zip(group, offsets)])
+            h1 = lambda offsets: torch.stack([s.h1[k % T] for s, k in zip(group, offsets)])
+            zeros_in = torch.zeros(len(group), self.input_channels)
+            zeros_hidden = torch.zeros(len(group), self.num_filters)
+
+            first = self._layer1(zeros_in, frames(starts), frames([s + 1 for s in starts]))
+            last = self._layer1(frames([n - 1 for n in ends]), frames(ends), zeros_in)
+            u_start1, u_start2 = h1([s + 1 for s in starts]), h1([s + 2 for s in starts])
+            u_end2, u_end1 = h1([n - 2 for n in ends]), h1([n - 1 for n in ends])
+
+            edges = (
+                self._layer2(zeros_hidden, first, u_start1)
+                + self._layer2(first, u_start1, u_start2)
+                + self._layer2(u_end2, u_end1, last)
+                + self._layer2(u_end1, last, zeros_hidden)
+            )
+            interior = torch.stack([state.pool_sum for state in group])
+            pooled = ((interior + edges.double()) / T).to(self.fc_weight.dtype)
+            logits[full] = pooled @ self.fc_weight + self.fc_bias
+
+        return logits
+
+
+def verify_streaming_equivalence(model, num_frames=120, window=30, batch_size=4, seed=0):
+    """Max abs difference between StreamingTCN and ASLTCN.forward on every sliding window"""
+    generator = torch.Generator().manual_seed(seed)
+    model = model.eval()
+    streaming = model.streaming(window)
+    sequences = torch.rand(batch_size, num_frames, streaming.input_channels, generator=generator)
+    # Some frames without a hand, as the extractor emits them
+    sequences[:, ::7] = 0.0
+
+    states = [streaming.init_state() for _ in range(batch_size)]
+    max_diff = 0.0
+    with torch.no_grad():
+        for n in range(num_frames):
+            streaming.step(states, sequences[:, n])
+            start = max(0, n + 1 - window)
+            expected_window = torch.zeros(batch_size, window, streaming.input_channels)
+            expected_window[:, :n + 1 - start] = sequences[:, start:n + 1]
+            expected = model(expected_window)
+            max_diff = max(max_diff, (streaming.readout(states) - expected).abs().max().item())
+    return max_diff
+
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    model = ASLTCN()
+    # Non-trivial BatchNorm statistics so the folding is actually exercised
+    for bn in (model.bn1, model.bn2):
+        bn.running_mean.uniform_(-0.5, 0.5)
+        bn.running_var.uniform_(0.5, 2.0)
+        bn.weight.data.uniform_(0.5, 1.5)
+        bn.bias.data.uniform_(-0.2, 0.2)
+    max_diff = verify_streaming_equivalence(model)
+    print(f"StreamingTCN vs ASLTCN.forward: max abs logit difference {max_diff:.2e}")
+    if max_diff > 1e-4:
+        raise SystemExit(1)
@@ -1,8 +1,51 @@
 import os
+import glob
 import json
+import time
+import shutil
+import tempfile
+import cv2
+import numpy as np
 from ultralytics import YOLO
 from typing import List, Dict, Any, Optional
 
+
+def letterbox_image(image_path: str, img_size: int) -> np.ndarray:
+    """Load an image as a (1, 3, img_size, img_size) float32 YOLO input"""
+    image = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2RGB)
+    h, w = image.shape[:2]
+    ratio = min(img_size / h, img_size / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    
+    pad_w, pad_h = (img_size - new_w) / 2, (img_size - new_h) / 2
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    
+    return np.ascontiguousarray(image.transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+class CalibrationImageReader:
+    """ONNX Runtime calibration data reader over a directory of images"""
+    
+    def __init__(self, image_paths: List[str], input_name: str, img_size: int = 640):
+        self.image_paths = image_paths
+        self.input_name = input_name
+        self.img_size = img_size
+        self._index = 0
+    
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        if self._index >= len(self.image_paths):
+            return None
+        image_path = self.image_paths[self._index]
+        self._index += 1
+        return {self.input_name: letterbox_image(image_path, self.img_size)}
+    
+    def rewind(self):
+        self._index = 0
+
+
 class YOLOSignDetector:
     """YOLO-based sign language detector"""
     
@@ -12,8 +55,9 @@ class YOLOSignDetector:
         self.model_path = model_path
         
     def load_model(self, model_path: str, class_names_path: str):
-        """Load trained YOLO model and class names"""
-        self.model = YOLO(model_path)
+        """Load trained YOLO model (.pt, .onnx or OpenVINO dir) and class names"""
+        # Exported formats don't carry the task, so set it explicitly
+        self.model = YOLO(model_path, task='detect')
         
         with open(class_names_path, 'r') as f:
             self.class_names = json.load(f)
@@ -71,13 +115,39 @@ class YOLOSignDetector:
                         })
         
         return detections
-    
-    def evaluate(self, val_data_path: str) -> Dict[str, float]:
+
+    def predict_batch(self, images: List[np.ndarray], confidence_threshold: float = 0.5,
+                      img_size: int = 640) -> List[List[Dict[str, Any]]]:
+        """Predict signs in a batch of BGR frames with a single forward pass"""
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+
+        results = self.model.predict(images, conf=confidence_threshold, imgsz=img_size, verbose=False)
+
+        batch_detections = []
+        for result in results:
+            detections = []
+            if result.boxes is not None and len(result.boxes):
+                # One host copy of (x1, y1, x2, y2, conf, cls) per image, sorted by confidence
+                data = result.boxes.data.cpu().numpy()
+                data = data[np.argsort(-data[:, 4], kind='stable')]
+                for x1, y1, x2, y2, conf, cls in data.tolist():
+                    cls = int(cls)
+                    detections.append({
+                        'class': self.class_names[cls] if cls < len(self.class_names) else f'class_{cls}',
+                        'confidence': conf,
+                        'bbox': [int(x1), int(y1), int(x2), int(y2)]
+                    })
+            batch_detections.append(detections)
+
+        return batch_detections
+
+    def evaluate(self, val_data_path: str, **kwargs) -> Dict[str, float]:
         """Evaluate model on validation data"""
         if self.model is None:
             raise ValueError("Model not loaded.")
         
-        metrics = self.model.val(data=val_data_path)
+        metrics = self.model.val(data=val_data_path, **kwargs)
         
         return {
             'mAP50': float(metrics.box.map50),
@@ -86,6 +156,198 @@ class YOLOSignDetector:
             'recall': float(metrics.box.mr)
         }
     
+    def export(self, format: str = 'onnx', img_size: int = 640, dynamic: bool = True, **kwargs) -> str:
+        """Export model for a CPU runtime ('onnx' for ONNX Runtime, 'openvino')"""
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        
+        export_params = {
+            'format': format,
+            'imgsz': img_size,
+            'dynamic': dynamic,  # Dynamic batch/resolution for batched serving
+        }
+        if format == 'onnx':
+            export_params['simplify'] = True
+        export_params.update(kwargs)
+        
+        export_path = self.model.export(**export_params)
+        
+        print(f"Model exported to: {export_path}")
+        return export_path
+    
+    def quantize_int8(self, yolo_dir: str, output_path: Optional[str] = None, img_size: int = 640,
+                      num_calibration_images: int = 200) -> str:
+        """Post-training static INT8 quantization calibrated on the YOLO val split
+        
+        yolo_dir is the directory written by YOLODataProcessor.prepare_yolo_dataset.
+        Returns the path of the quantized ONNX model.
+        """
+        from onnxruntime.quantization import quantize_static, QuantFormat, QuantType, CalibrationMethod
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+        import onnxruntime as ort
+        
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        
+        calibration_images = self._val_images(yolo_dir)[:num_calibration_images]
+        if not calibration_images:
+            raise ValueError(f"No validation images found in {yolo_dir}")
+        
+        if output_path is None:
+            output_path = os.path.splitext(self.model_path)[0] + '_int8.onnx'
+        
+        # Ultralytics exports next to the checkpoint, where the served dynamic fp32 graph
+        # lives; keep that one aside so the static calibration export can't replace it
+        serving_path = os.path.splitext(self.model_path)[0] + '.onnx'
+        work_dir = tempfile.mkdtemp(prefix='yolo_int8_')
+        backup_path = os.path.join(work_dir, 'serving.onnx')
+        if os.path.exists(serving_path):
+            shutil.move(serving_path, backup_path)
+        
+        try:
+            # Calibrate on a static input shape so activation ranges are well defined
+            fp32_path = os.path.join(work_dir, 'static.onnx')
+            shutil.move(self.export(format='onnx', img_size=img_size, dynamic=False), fp32_path)
+            if os.path.exists(backup_path):
+                shutil.move(backup_path, serving_path)
+            
+            prepared_path = os.path.join(work_dir, 'prep.onnx')
+            quant_pre_process(fp32_path, prepared_path)
+            
+            input_name = ort.InferenceSession(prepared_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+            reader = CalibrationImageReader(calibration_images, input_name, img_size)
+            
+            print(f"Calibrating INT8 model on {len(calibration_images)} images...")
+            quantize_static(
+                prepared_path,
+                output_path,
+                reader,
+                quant_format=QuantFormat.QDQ,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+                calibrate_method=CalibrationMethod.MinMax
+            )
+        finally:
+            if os.path.exists(backup_path):
+                shutil.move(backup_path, serving_path)
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        print(f"INT8 model saved to: {output_path}")
+        return output_path
+    
+    def benchmark_latency(self, image_paths: List[str], img_size: int = 640, warmup: int = 3) -> Dict[str, float]:
+        """Measure per-image predict latency (ms) over the given images"""
+        if self.model is None:
+            raise ValueError("Model not loaded.")
+        
+        for image_path in image_paths[:warmup]:
+            self.model.predict(image_path, imgsz=img_size, verbose=False)
+        
+        latencies = []
+        for image_path in image_paths:
+            start = time.perf_counter()
+            self.model.predict(image_path, imgsz=img_size, verbose=False)
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        return self._latency_summary(latencies)
+    
+    def benchmark_onnx_latency(self, onnx_path: str, image_paths: List[str], img_size: int = 640,
+                               warmup: int = 3, intra_op_threads: int = 0) -> Dict[str, float]:
+        """Measure per-image ONNX Runtime latency (ms) of an ONNX graph
+        
+        Every graph gets the same CPU session options, so two runs differ only in the graph.
+        Images are letterboxed before the timer starts.
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+        input_name = session.get_inputs()[0].name
+        
+        for image_path in image_paths[:warmup]:
+            session.run(None, {input_name: letterbox_image(image_path, img_size)})
+        
+        latencies = []
+        for image_path in image_paths:
+            image = letterbox_image(image_path, img_size)
+            start = time.perf_counter()
+            session.run(None, {input_name: image})
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        return self._latency_summary(latencies)
+    
+    @staticmethod
+    def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+        return {
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'mean_ms': float(np.mean(latencies))
+        }
+    
+    def quantization_report(self, yolo_dir: str, int8_path: str, img_size: int = 640,
+                            report_path: Optional[str] = None, fp32_path: Optional[str] = None,
+                            intra_op_threads: int = 0, include_pytorch: bool = False) -> Dict[str, Any]:
+        """Compare mAP50 and latency of the FP32 ONNX graph against an INT8 artifact
+        
+        fp32_path defaults to the served dynamic graph next to the checkpoint (exported
+        if missing). Both graphs run on ONNX Runtime with the same session options, so
+        the speedup comes from precision alone. include_pytorch adds the loaded model
+        under 'pytorch' for reference.
+        """
+        if self.model is None:
+            raise ValueError("Model not loaded.")
+        
+        data_yaml = os.path.join(yolo_dir, 'data.yaml')
+        val_images = self._val_images(yolo_dir)
+        
+        if fp32_path is None:
+            fp32_path = os.path.splitext(self.model_path)[0] + '.onnx'
+            if not os.path.exists(fp32_path):
+                fp32_path = self.export(format='onnx', img_size=img_size, dynamic=True)
+        
+        report = {}
+        for name, onnx_path in (('fp32', fp32_path), ('int8', int8_path)):
+            detector = YOLOSignDetector(onnx_path)
+            detector.model = YOLO(onnx_path, task='detect')
+            detector.class_names = self.class_names
+            # Static-shape INT8 graph needs batch 1 at img_size; use the same for FP32
+            metrics = detector.evaluate(data_yaml, imgsz=img_size, batch=1)
+            latency = self.benchmark_onnx_latency(onnx_path, val_images, img_size,
+                                                  intra_op_threads=intra_op_threads)
+            report[name] = {**metrics, **latency}
+        
+        if include_pytorch:
+            metrics = self.evaluate(data_yaml, imgsz=img_size, batch=1)
+            report['pytorch'] = {**metrics, **self.benchmark_latency(val_images, img_size)}
+        
+        report['mAP50_drop'] = report['fp32']['mAP50'] - report['int8']['mAP50']
+        report['p50_speedup'] = report['fp32']['p50_ms'] / report['int8']['p50_ms']
+        report['p95_speedup'] = report['fp32']['p95_ms'] / report['int8']['p95_ms']
+        
+        if report_path is None:
+            report_path = os.path.splitext(int8_path)[0] + '_report.json'
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        for name in ('fp32', 'int8', 'pytorch'):
+            if name in report:
+                entry = report[name]
+                print(f"{name.upper()} mAP50={entry['mAP50']:.4f} p50={entry['p50_ms']:.1f}ms p95={entry['p95_ms']:.1f}ms")
+        print(f"Report saved to: {report_path}")
+        
+        return report
+    
+    @staticmethod
+    def _val_images(yolo_dir: str) -> List[str]:
+        val_dir = os.path.join(yolo_dir, 'val', 'images')
+        return sorted(
+            path for ext in ('*.jpg', '*.jpeg', '*.png', '*.bmp')
+            for path in glob.glob(os.path.join(val_dir, ext))
+        )
+    
     def save_model(self, save_dir: str):
         """Save model and class names"""
         if self.model is None:
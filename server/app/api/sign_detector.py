@@ -1,22 +1,88 @@
 import io
+import json
+import asyncio
 import logging
 import uuid
 import os
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Header
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Header, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from typing import Optional, List
 from PIL import Image
-from ..services.model_service import model_service
-from ..utils.validation import validate_image_file
+from ..services.model_service import model_service, ModelReloadInProgressError
+from ..services.model_registry import UnknownModelError, ModelUnavailableError, ModelBusyError
+from ..services.keypoint_recognizer import parse_keypoint_frames, KeypointExtractorUnavailableError
+from ..services.inference_executor import inference_executor, InferenceQueueFullError
+from ..utils.validation import validate_image_file, validate_raw_image_request, MAX_IMAGE_BYTES
+from ..utils.response_formats import negotiated_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+async def run_inference(fn, *args):
+    """Run a blocking model call on the inference pool, shedding load when full"""
+    try:
+        return await inference_executor.run(fn, *args)
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting inference request: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, inference queue is full. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ModelBusyError as e:
+        logger.warning(f"Rejecting inference request: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+def requested_model(path_value: Optional[str], header_value: Optional[str]) -> Optional[str]:
+    """Model named in the path (/models/{name}/...), then the X-Model header; None lets the registry split traffic"""
+    return path_value or header_value or None
+
+async def read_raw_image(request: Request) -> bytes:
+    """Read a raw image request body chunk by chunk, rejecting it once it passes the size cap"""
+    validation_error = validate_raw_image_request(
+        request.headers.get("content-type"), request.headers.get("content-length")
+    )
+    if validation_error:
+        status_code, detail = validation_error
+        raise HTTPException(status_code=status_code, detail=detail)
+    
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="File size must be less than 10MB")
+        chunks.append(chunk)
+    
+    if not received:
+        raise HTTPException(status_code=400, detail="No image data provided")
+    return b"".join(chunks)
+
+def resolve_confidence(query_value: Optional[float], header_value: Optional[float]) -> float:
+    """Confidence threshold from the query string, then the header, then the default"""
+    if query_value is not None:
+        return query_value
+    if header_value is not None:
+        return header_value
+    return 0.25
+
 @router.post("/predict-stream")
+@router.post("/models/{model_name}/predict-stream")
 async def predict_stream(
     file: UploadFile = File(...),
     session_id: Optional[str] = Header(None, alias="X-Session-ID"),
-    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0)
+    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    adaptive_resolution: Optional[bool] = Query(None, description="Adapt input resolution to detection confidence"),
+    roi_tracking: Optional[bool] = Query(None, description="Detect in a crop around the previous hand bbox"),
+    frame_skip: Optional[bool] = Query(None, description="Reuse the previous result for near-duplicate frames"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Stream prediction for building sentences from sign language video
@@ -25,6 +91,12 @@ async def predict_stream(
         file: Image frame from video stream
         session_id: Session identifier for sentence building
         confidence_threshold: Minimum confidence for detections
+        img_size: Input resolution override (rounded to a multiple of 32)
+        adaptive_resolution: Lower the resolution while detections stay confident
+        roi_tracking: Detect in a crop around the previous bbox, full frame on a miss
+        frame_skip: Skip inference when the frame barely differs from the last inferred one
+        model_name: Registry model (/models/{model_name}/predict-stream or X-Model header);
+            otherwise the session is assigned one by traffic weight and keeps it
     
     Returns:
         Detection results with updated sentence
@@ -44,24 +116,33 @@ async def predict_stream(
     
     try:
         image_data = await file.read()
-        result = model_service.predict_stream(
+        result = await run_inference(
+            model_service.predict_stream,
             image_data, 
             session_id, 
-            confidence_threshold
+            confidence_threshold,
+            img_size,
+            adaptive_resolution,
+            roi_tracking,
+            frame_skip,
+            requested_model(model_name, model_header)
         )
         
         logger.debug(f"Stream prediction for session {session_id}: {result['sentence_info']['sentence']}")
         
-        return JSONResponse(content={
+        return negotiated_response({
             "success": True,
             "data": result,
             "metadata": {
                 "filename": file.filename,
                 "session_id": session_id,
-                "confidence_threshold": confidence_threshold
+                "confidence_threshold": confidence_threshold,
+                "img_size": result["img_size"]
             }
-        })
+        }, accept, packed=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Stream prediction error: {str(e)}")
         raise HTTPException(
@@ -70,10 +151,18 @@ async def predict_stream(
         )
     
 @router.post("/predict-base64-stream")
+@router.post("/models/{model_name}/predict-base64-stream")
 async def predict_base64_stream(
     request_data: dict,
     session_id: Optional[str] = Header(None, alias="X-Session-ID"),
-    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0)
+    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    adaptive_resolution: Optional[bool] = Query(None, description="Adapt input resolution to detection confidence"),
+    roi_tracking: Optional[bool] = Query(None, description="Detect in a crop around the previous hand bbox"),
+    frame_skip: Optional[bool] = Query(None, description="Reuse the previous result for near-duplicate frames"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Stream prediction from base64 encoded image for sentence building
@@ -98,25 +187,106 @@ async def predict_base64_stream(
         image_bytes = base64.b64decode(image_base64)
         image = Image.open(io.BytesIO(image_bytes))
         
-        result = model_service.predict_stream(
+        result = await run_inference(
+            model_service.predict_stream,
             image, 
             session_id, 
-            confidence_threshold
+            confidence_threshold,
+            img_size,
+            adaptive_resolution,
+            roi_tracking,
+            frame_skip,
+            requested_model(model_name, model_header)
         )
         
-        return JSONResponse(content={
+        return negotiated_response({
             "success": True,
             "data": result,
             "metadata": {
                 "session_id": session_id,
-                "confidence_threshold": confidence_threshold
+                "confidence_threshold": confidence_threshold,
+                "img_size": result["img_size"]
             }
-        })
+        }, accept, packed=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Base64 continuous prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@router.post("/keypoints/stream")
+async def predict_keypoint_stream(
+    request_data: dict,
+    session_id: Optional[str] = Header(None, alias="X-Session-ID"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Word recognition from a stream of hand keypoints (ASLTCN/ASLLSTM)
+    Expected format: {"keypoints": [[x0, y0, ..., x20, y20], null, ...]}
+    
+    Each frame is the 21 MediaPipe hand landmarks as 42 normalized (x, y) values,
+    or null when no hand was visible. Frames go into the session's sliding window;
+    every KEYPOINT_STRIDE frames the window is scored and the result is fed to the
+    session sentence, so evaluated=false responses carry no recognition.
+    """
+    if not model_service.keypoint_recognizer.is_loaded:
+        raise HTTPException(status_code=503, detail="Keypoint model not available")
+    
+    if not session_id:
+        session_id = str(uuid.uuid4())
+    
+    frames = request_data.get("keypoints")
+    if not isinstance(frames, list) or not frames:
+        raise HTTPException(status_code=400, detail="No keypoint frames provided")
+    try:
+        frames = parse_keypoint_frames(frames)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid keypoints: {str(e)}")
+    
+    try:
+        result = await run_inference(model_service.predict_keypoint_stream, frames, session_id)
+        return negotiated_response({"success": True, "data": result}, accept)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Keypoint stream error for session {session_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Recognition failed: {str(e)}")
+
+@router.post("/keypoints/predict-stream")
+async def predict_keypoint_image_stream(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = Header(None, alias="X-Session-ID"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Word recognition from video frames: hand keypoints are extracted server-side
+    with MediaPipe (requires mediapipe), then handled like /keypoints/stream
+    """
+    if not model_service.keypoint_recognizer.is_loaded:
+        raise HTTPException(status_code=503, detail="Keypoint model not available")
+    
+    if not session_id:
+        session_id = str(uuid.uuid4())
+    
+    validation_error = validate_image_file(file)
+    if validation_error:
+        raise HTTPException(status_code=400, detail=validation_error)
+    
+    try:
+        image_data = await file.read()
+        result = await run_inference(model_service.predict_keypoint_frame, image_data, session_id)
+        return negotiated_response({"success": True, "data": result}, accept)
+    
+    except HTTPException:
+        raise
+    except KeypointExtractorUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Keypoint frame error for session {session_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Recognition failed: {str(e)}")
+
 @router.get("/sentence/{session_id}")
 async def get_current_sentence(session_id: str):
     """Get current sentence for a session"""
@@ -145,10 +315,173 @@ async def clear_sentence(session_id: str):
         logger.error(f"Error clearing sentence for session {session_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+MAX_WS_FRAME_BYTES = MAX_IMAGE_BYTES
+
+@router.websocket("/ws/{session_id}")
+async def predict_websocket(
+    websocket: WebSocket,
+    session_id: str,
+    confidence_threshold: float = Query(0.25, ge=0.0, le=1.0),
+    adaptive_resolution: Optional[bool] = Query(None),
+    roi_tracking: Optional[bool] = Query(None),
+    frame_skip: Optional[bool] = Query(None),
+    model: Optional[str] = Query(None, description="Registry model to use for this session")
+):
+    """
+    Continuous sentence building over a WebSocket
+    
+    Client sends binary JPEG frames; server replies with one JSON message per
+    processed frame. sentence_info is only included when the sentence changed.
+    If inference falls behind, older unprocessed frames are dropped so only the
+    latest frame is ever waiting. Text message {"action": "clear"} clears the
+    session sentence.
+    """
+    await websocket.accept()
+    
+    if not model_service.is_loaded:
+        await websocket.close(code=1011, reason="Model not available")
+        return
+    
+    if model:
+        try:
+            model_service.registry.route(model)
+        except (UnknownModelError, ModelUnavailableError) as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+    
+    latest = {"frame": None, "frame_id": 0}
+    frame_ready = asyncio.Event()
+    send_lock = asyncio.Lock()
+    stats = {"received": 0, "processed": 0, "dropped": 0}
+    
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_json(message)
+    
+    async def receive_frames():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            
+            frame = message.get("bytes")
+            if frame is not None:
+                if len(frame) > MAX_WS_FRAME_BYTES:
+                    await send({"type": "error", "detail": "Frame size must be less than 10MB"})
+                    continue
+                stats["received"] += 1
+                # Latest frame wins: replace any frame still waiting for inference
+                if latest["frame"] is not None:
+                    stats["dropped"] += 1
+                latest["frame"] = frame
+                latest["frame_id"] += 1
+                frame_ready.set()
+                continue
+            
+            text = message.get("text")
+            if text:
+                try:
+                    command = json.loads(text)
+                except ValueError:
+                    command = {"action": text.strip()}
+                if isinstance(command, str):
+                    command = {"action": command}
+                if not isinstance(command, dict):
+                    await send({"type": "error", "detail": "Commands must be a JSON object or an action name"})
+                    continue
+                if command.get("action") == "clear":
+                    result = model_service.clear_session_sentence(session_id)
+                    await send({"type": "cleared", **result})
+    
+    async def process_frames():
+        last_sentence_state = None
+        while True:
+            await frame_ready.wait()
+            frame_ready.clear()
+            frame, frame_id = latest["frame"], latest["frame_id"]
+            latest["frame"] = None
+            if frame is None:
+                continue
+            
+            try:
+                result = await inference_executor.run(
+                    model_service.predict_stream,
+                    frame,
+                    session_id,
+                    confidence_threshold,
+                    None,
+                    adaptive_resolution,
+                    roi_tracking,
+                    frame_skip,
+                    model
+                )
+            except (InferenceQueueFullError, ModelBusyError):
+                stats["dropped"] += 1
+                continue
+            except Exception as e:
+                logger.error(f"WebSocket prediction error for session {session_id}: {str(e)}")
+                await send({"type": "error", "frame_id": frame_id, "detail": f"Prediction failed: {str(e)}"})
+                continue
+            
+            stats["processed"] += 1
+            sentence_info = result["sentence_info"]
+            message = {
+                "type": "prediction",
+                "frame_id": frame_id,
+                "predicted_class": result["predicted_class"],
+                "confidence": result["confidence"],
+                "bbox": result["bbox"],
+                "inference_time": result["inference_time"],
+                "resolution": result["resolution"],
+                "roi": result.get("roi"),
+                "frame_skip": result.get("frame_skip"),
+                "model_version": result["model_version"],
+                "model_name": result.get("model_name"),
+                "received_frames": stats["received"],
+                "dropped_frames": stats["dropped"]
+            }
+            
+            sentence_state = (sentence_info["sentence"], sentence_info["current_word"])
+            if sentence_state != last_sentence_state:
+                message["sentence_info"] = sentence_info
+                last_sentence_state = sentence_state
+            
+            await send(message)
+    
+    receiver = asyncio.create_task(receive_frames())
+    processor = asyncio.create_task(process_frames())
+    try:
+        done, pending = await asyncio.wait(
+            {receiver, processor}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"WebSocket error for session {session_id}: {str(e)}")
+    finally:
+        receiver.cancel()
+        processor.cancel()
+        logger.info(
+            f"WebSocket session {session_id} closed: {stats['received']} frames received, "
+            f"{stats['processed']} processed, {stats['dropped']} dropped"
+        )
+
 @router.post("/predict")
+@router.post("/models/{model_name}/predict")
 async def predict_sign_language(
     file: UploadFile = File(...),
-    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0, description="Minimum confidence threshold")
+    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    max_detections: Optional[int] = Query(None, ge=1, le=300, description="Keep only the top-k detections"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Predict sign language from uploaded image using model
@@ -156,6 +489,10 @@ async def predict_sign_language(
     Args:
         file: Image file to analyze
         confidence_threshold: Minimum confidence for detections (0.0-1.0)
+        img_size: Input resolution override (rounded to a multiple of 32)
+        max_detections: Return only the most confident detections
+        model_name: Registry model (/models/{model_name}/predict or X-Model header);
+            otherwise picked by traffic weight
     
     Returns:
         Detection results with classes, confidences, and bounding boxes
@@ -172,20 +509,26 @@ async def predict_sign_language(
     
     try:
         image_data = await file.read()
-        result = model_service.predict(image_data, confidence_threshold)
+        result = await run_inference(
+            model_service.predict, image_data, confidence_threshold, img_size, max_detections,
+            requested_model(model_name, model_header)
+        )
         
         logger.info(f"Prediction made for {file.filename}: {result['num_detections']} detections")
         
-        return JSONResponse(content={
+        return negotiated_response({
             "success": True,
             "data": result,
             "metadata": {
                 "filename": file.filename,
                 "file_size": file.size,
-                "confidence_threshold": confidence_threshold
+                "confidence_threshold": confidence_threshold,
+                "img_size": result["img_size"]
             }
-        })
+        }, accept, packed=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction error for {file.filename}: {str(e)}")
         raise HTTPException(
@@ -193,65 +536,89 @@ async def predict_sign_language(
             detail=f"Prediction failed: {str(e)}"
         )
 
+MAX_BATCH_FILES = int(os.environ.get('PREDICT_BATCH_MAX_FILES', '64'))
+
 @router.post("/predict-batch")
+@router.post("/models/{model_name}/predict-batch")
 async def predict_batch(
     files: List[UploadFile] = File(...),
-    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0)
+    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    max_detections: Optional[int] = Query(None, ge=1, le=300, description="Keep only the top-k detections"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Predict sign language for multiple images
+    
+    Images are decoded in parallel and run through the model as batched forward
+    passes. A file that fails validation, decoding or inference only fails its own
+    entry. The response includes per-stage timings.
     """
     if not model_service.is_loaded:
         raise HTTPException(status_code=503, detail="Model not available")
     
-    if len(files) > 10:
-        raise HTTPException(status_code=400, detail="Maximum 10 files per batch")
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_FILES} files per batch")
     
-    results = []
+    results = [None] * len(files)
+    pending = []
     for i, file in enumerate(files):
-        try:
-            validation_error = validate_image_file(file)
-            if validation_error:
-                results.append({
-                    "filename": file.filename,
-                    "success": False,
-                    "error": validation_error,
-                    "index": i
-                })
-                continue
-            
-            image_data = await file.read()
-            result = model_service.predict(image_data, confidence_threshold)
-            results.append({
-                "filename": file.filename,
-                "success": True,
-                "data": result,
-                "index": i
-            })
-            
-        except Exception as e:
-            results.append({
+        validation_error = validate_image_file(file)
+        if validation_error:
+            results[i] = {
                 "filename": file.filename,
                 "success": False,
-                "error": str(e),
+                "error": validation_error,
                 "index": i
-            })
+            }
+            continue
+        pending.append((i, file.filename, await file.read()))
+    
+    timings = {"decode": 0.0, "inference": 0.0, "postprocess": 0.0, "total": 0.0}
+    if pending:
+        try:
+            batch = await run_inference(
+                model_service.predict_batch,
+                [image_data for _, _, image_data in pending],
+                confidence_threshold,
+                img_size,
+                max_detections,
+                requested_model(model_name, model_header)
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Batch prediction error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        
+        timings = batch["timings"]
+        for (i, filename, _), item in zip(pending, batch["results"]):
+            results[i] = {"filename": filename, **item, "index": i}
     
     successful_predictions = sum(1 for r in results if r["success"])
     
-    return JSONResponse(content={
+    return negotiated_response({
         "results": results,
         "summary": {
             "total_files": len(files),
             "successful_predictions": successful_predictions,
             "failed_predictions": len(files) - successful_predictions
-        }
-    })
+        },
+        "timings": timings
+    }, accept)
 
 @router.post("/predict-base64")
+@router.post("/models/{model_name}/predict-base64")
 async def predict_from_base64(
     image_data: dict,
-    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0)
+    confidence_threshold: Optional[float] = Query(0.25, ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    max_detections: Optional[int] = Query(None, ge=1, le=300, description="Keep only the top-k detections"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Predict sign language from base64 encoded image
@@ -271,19 +638,128 @@ async def predict_from_base64(
             image_base64 = image_base64.split(',')[1]
         
         image_bytes = base64.b64decode(image_base64)
-        image = Image.open(io.BytesIO(image_bytes))
         
-        result = model_service.predict(image, confidence_threshold)
+        # Pass the bytes through so repeated uploads can hit the prediction cache
+        result = await run_inference(
+            model_service.predict, image_bytes, confidence_threshold, img_size, max_detections,
+            requested_model(model_name, model_header)
+        )
         
-        return JSONResponse(content={
+        return negotiated_response({
             "success": True,
             "data": result
-        })
+        }, accept, packed=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Base64 prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@router.post("/predict-raw")
+@router.post("/models/{model_name}/predict-raw")
+async def predict_raw(
+    request: Request,
+    confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    confidence_header: Optional[float] = Header(None, alias="X-Confidence-Threshold", ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    max_detections: Optional[int] = Query(None, ge=1, le=300, description="Keep only the top-k detections"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Predict sign language from a raw image request body
+    
+    Send the encoded image itself as the body (Content-Type application/octet-stream
+    or image/jpeg), with no multipart form or base64. The confidence threshold can be
+    given as a query parameter or as the X-Confidence-Threshold header.
+    """
+    if not model_service.is_loaded:
+        raise HTTPException(status_code=503, detail="Model not available")
+    
+    image_data = await read_raw_image(request)
+    confidence_threshold = resolve_confidence(confidence_threshold, confidence_header)
+    
+    try:
+        result = await run_inference(
+            model_service.predict, image_data, confidence_threshold, img_size, max_detections,
+            requested_model(model_name, model_header)
+        )
+        
+        return negotiated_response({
+            "success": True,
+            "data": result,
+            "metadata": {
+                "confidence_threshold": confidence_threshold,
+                "img_size": result["img_size"]
+            }
+        }, accept, packed=True)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Raw prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@router.post("/predict-raw-stream")
+@router.post("/models/{model_name}/predict-raw-stream")
+async def predict_raw_stream(
+    request: Request,
+    session_id: Optional[str] = Query(None),
+    session_header: Optional[str] = Header(None, alias="X-Session-ID"),
+    confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    confidence_header: Optional[float] = Header(None, alias="X-Confidence-Threshold", ge=0.0, le=1.0),
+    img_size: Optional[int] = Query(None, ge=160, le=1280, description="Input resolution override"),
+    adaptive_resolution: Optional[bool] = Query(None, description="Adapt input resolution to detection confidence"),
+    roi_tracking: Optional[bool] = Query(None, description="Detect in a crop around the previous hand bbox"),
+    frame_skip: Optional[bool] = Query(None, description="Reuse the previous result for near-duplicate frames"),
+    model_name: Optional[str] = None,
+    model_header: Optional[str] = Header(None, alias="X-Model"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Stream prediction from a raw image request body for sentence building
+    
+    Same body format as /predict-raw. The session comes from the X-Session-ID header
+    or the session_id query parameter.
+    """
+    if not model_service.is_loaded:
+        raise HTTPException(status_code=503, detail="Model not available")
+    
+    session_id = session_id or session_header or str(uuid.uuid4())
+    image_data = await read_raw_image(request)
+    confidence_threshold = resolve_confidence(confidence_threshold, confidence_header)
+    
+    try:
+        result = await run_inference(
+            model_service.predict_stream,
+            image_data,
+            session_id,
+            confidence_threshold,
+            img_size,
+            adaptive_resolution,
+            roi_tracking,
+            frame_skip,
+            requested_model(model_name, model_header)
+        )
+        
+        return negotiated_response({
+            "success": True,
+            "data": result,
+            "metadata": {
+                "session_id": session_id,
+                "confidence_threshold": confidence_threshold,
+                "img_size": result["img_size"]
+            }
+        }, accept, packed=True)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Raw stream prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
 @router.get("/model/info")
 async def get_model_info():
     """Get YOLO model information and status"""
@@ -302,22 +778,61 @@ async def get_model_classes():
 
 @router.post("/model/reload")
 async def reload_model():
-    """Reload the YOLO model (admin endpoint)"""
+    """
+    Hot-swap the YOLO model (admin endpoint)
+    
+    Reloads the configured model files (the same paths used at startup). The new
+    model is loaded and warmed up off the event loop while the current one keeps
+    serving. It is then swapped in atomically, and requests already in flight
+    finish on the version they started with. If loading fails, the current model
+    stays in service.
+    """
+    previous_version = model_service.model_version
     try:
-        model_path = os.path.join("app", "models", "saved_models", "sign_language_yolo.pt")
-        class_names_path = os.path.join("app", "models", "saved_models", "class_names.json")
-        
-        success = model_service.load_model(model_path, class_names_path)
+        reload_info = await asyncio.to_thread(model_service.swap_model)
         
-        if success:
-            return JSONResponse(content={
-                "success": True, 
-                "message": "YOLO model reloaded successfully",
-                "model_info": model_service.get_model_info()
-            })
-        else:
-            raise HTTPException(status_code=500, detail="Failed to reload model")
-            
+        return JSONResponse(content={
+            "success": True, 
+            "message": "YOLO model reloaded successfully",
+            "reload": reload_info,
+            "model_info": model_service.get_model_info()
+        })
+    
+    except ModelReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Model reload error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(
+            status_code=500,
+            detail=f"Reload failed: {str(e)}; still serving version {previous_version}"
+        )
+
+@router.get("/models")
+async def list_models():
+    """Registered models with routing weights, concurrency and latency stats"""
+    return JSONResponse(content={
+        "primary": model_service.registry.primary.name,
+        "models": model_service.registry.get_stats()
+    })
+
+@router.post("/models/{model_name}/reload")
+async def reload_registry_model(model_name: str):
+    """Hot-swap one registry model from its configured files (same semantics as /model/reload)"""
+    try:
+        model_service.registry.get(model_name)
+        reload_info = await asyncio.to_thread(model_service.swap_model, None, None, model_name)
+        
+        return JSONResponse(content={
+            "success": True,
+            "message": f"Model '{model_name}' reloaded successfully",
+            "reload": reload_info,
+            "model": model_service.registry.get(model_name).get_stats()
+        })
+    
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ModelReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model reload error for {model_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
@@ -1,12 +1,18 @@
+import asyncio
 import logging
 import os
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from .api import auth
-from .api.sign_detector import router as sign_detector_router
-from .models.user import Base
-from .utils.db import engine
-from .services.model_service import model_service
+from .utils.startup_profile import startup_profile
+
+with startup_profile.phase("import app modules"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from .api import auth
+    from .api.sign_detector import router as sign_detector_router
+    from .models.user import Base
+    from .utils.db import engine
+    from .services.model_service import model_service
+    from .services.inference_executor import inference_executor
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,7 +20,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-Base.metadata.create_all(bind=engine)
+# Filled in by the background initialization started on startup
+startup_state = {
+    "database": False,
+    "database_error": None,
+    "complete": False
+}
 
 app = FastAPI(
     title="GesturePro API",
@@ -33,11 +44,18 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(sign_detector_router, prefix="/api/sign", tags=["sign_detection"])
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    logger.info("🚀 Starting GesturePro API...")
-    
+def init_database():
+    """Create tables; runs after startup so a slow database doesn't hold up liveness"""
+    try:
+        with startup_profile.phase("database create_all"):
+            Base.metadata.create_all(bind=engine)
+        startup_state["database"] = True
+    except Exception as e:
+        startup_state["database_error"] = str(e)
+        logger.error(f"❌ Database initialization failed: {str(e)}")
+
+def load_serving_model():
+    """Load and warm up the YOLO model from the configured paths"""
     model_path = os.environ.get('YOLO_MODEL_PATH')
     class_names_path = os.environ.get('CLASS_NAMES_PATH')
     
@@ -55,9 +73,18 @@ async def startup_event():
     
     if os.path.exists(model_path) and os.path.exists(class_names_path):
         logger.info("📦 Loading model...")
+        load_start = startup_profile.elapsed()
         success = model_service.load_model(model_path, class_names_path)
         if success:
+            reload_info = model_service.last_reload
+            startup_profile.record("model load", reload_info["load_time"], load_start)
+            if reload_info["warmup_time"] is not None:
+                startup_profile.record(
+                    "model warmup", reload_info["warmup_time"], load_start + reload_info["load_time"]
+                )
             logger.info("✅ Model loaded successfully!")
+            with startup_profile.phase("model registry"):
+                model_service.load_registry()
         else:
             logger.error("❌ Failed to load model")
     else:
@@ -66,6 +93,38 @@ async def startup_event():
         logger.warning(f"   Expected classes: {class_names_path}")
         logger.warning("   Make sure ML models are properly mounted in Docker")
 
+def load_keypoint_model():
+    """Load the keypoint sequence recognizer when KEYPOINT_MODEL_PATH is set"""
+    if not os.environ.get('KEYPOINT_MODEL_PATH'):
+        return
+    with startup_profile.phase("keypoint model load"):
+        if model_service.load_keypoint_model():
+            logger.info("✅ Keypoint recognizer loaded successfully!")
+
+def is_ready() -> bool:
+    """Ready for traffic once tables exist and a warmed-up model is serving"""
+    return startup_state["database"] and model_service.is_loaded
+
+async def initialize_services():
+    """Database setup and model load/warmup run side by side off the event loop"""
+    await asyncio.gather(
+        asyncio.to_thread(init_database),
+        asyncio.to_thread(load_serving_model),
+        asyncio.to_thread(load_keypoint_model)
+    )
+    startup_state["complete"] = True
+    if is_ready():
+        startup_profile.mark_ready()
+    else:
+        logger.warning("⚠️  Startup finished but the app is not ready; /health/ready will report 503")
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize services on startup"""
+    logger.info("🚀 Starting GesturePro API...")
+    # Don't block startup: liveness answers right away, readiness once warmed up
+    app.state.startup_task = asyncio.create_task(initialize_services())
+
 @app.get("/")
 async def root():
     return {
@@ -73,16 +132,50 @@ async def root():
         "status": "running",
         "version": "1.0.0",
         "model_loaded": model_service.is_loaded,
-        "model_type": "YOLOv8 PyTorch"
+        "model_type": model_service.model_type
     }
 
 @app.get("/health")
 async def health_check():
     model_info = model_service.get_model_info() if model_service.is_loaded else {}
+    ready = is_ready()
     
     return {
-        "status": "healthy",
+        "status": "healthy" if ready else "starting",
+        "ready": ready,
         "model_loaded": model_service.is_loaded,
-        "database": "connected",
-        "model_info": model_info
-    }
\ No newline at end of file
+        "database": "connected" if startup_state["database"] else "unavailable",
+        "model_info": model_info,
+        "inference_queue": inference_executor.get_stats(),
+        "startup": startup_profile.to_dict()
+    }
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the process is up and the event loop is responding"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness: 200 only once the database is set up and the model is warmed up"""
+    ready = is_ready()
+    content = {
+        "status": "ready" if ready else "not_ready",
+        "database": startup_state["database"],
+        "database_error": startup_state["database_error"],
+        "model_loaded": model_service.is_loaded,
+        "model_version": model_service.model_version,
+        "startup_complete": startup_state["complete"],
+        "ready_after": startup_profile.to_dict()["ready_after"]
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release inference workers on shutdown"""
+    inference_executor.shutdown()
+    model_service.batch_scheduler.stop()
+    model_service.keypoint_recognizer.scheduler.stop()
+    model_service.decode_pool.shutdown(wait=False)
+    model_service.sentence_builders.stop()
+    model_service.stream_states.stop()
\ No newline at end of file
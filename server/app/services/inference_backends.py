@@ -0,0 +1,345 @@
+import os
+import argparse
+import glob
+import logging
+import shutil
+import sys
+import time
+import cv2
+import numpy as np
+from PIL import Image
+from typing import List, Optional, Tuple
+from ..utils.startup_profile import startup_profile
+
+logger = logging.getLogger(__name__)
+
+def _yolo_class():
+    """Import ultralytics on first use; it pulls in torch and costs seconds at startup"""
+    if 'ultralytics' not in sys.modules:
+        with startup_profile.phase("import ultralytics"):
+            import ultralytics
+    from ultralytics import YOLO
+    return YOLO
+
+class Detections:
+    """Detections for one image as NumPy arrays in original-image pixel coordinates"""
+
+    __slots__ = ("xyxy", "conf", "cls")
+
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(
+            np.zeros((0, 4), dtype=np.float32),
+            np.zeros((0,), dtype=np.float32),
+            np.zeros((0,), dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+class InferenceBackend:
+    """Interface for a detector runtime serving the YOLO model"""
+
+    name = "base"
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self.task = "detect"
+        self.precision = "fp32"
+
+    def predict(self, images: List[np.ndarray], conf_threshold: float, img_size: int) -> List[Detections]:
+        """Run detection over a batch of RGB images"""
+        raise NotImplementedError
+
+class TorchBackend(InferenceBackend):
+    """Eager PyTorch model through ultralytics"""
+
+    name = "torch"
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        self.model = _yolo_class()(model_path)
+        self.task = self.model.task
+
+    def predict(self, images: List[np.ndarray], conf_threshold: float, img_size: int) -> List[Detections]:
+        # ultralytics reads numpy sources as BGR
+        sources = [cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR) for image in images]
+        results = self.model.predict(
+            source=sources,
+            conf=conf_threshold,
+            verbose=False,
+            imgsz=img_size
+        )
+        return [self._to_detections(result) for result in results]
+
+    @staticmethod
+    def _to_detections(result) -> Detections:
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return Detections.empty()
+        # One device-to-host copy of the packed (x1, y1, x2, y2, conf, cls) rows
+        data = boxes.data.cpu().numpy()
+        return Detections(data[:, :4], data[:, 4], data[:, 5].astype(np.int64))
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disabled": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL"
+}
+
+def letterbox(image: np.ndarray, size: int) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """Resize keeping aspect ratio and pad to size x size (YOLO letterbox)"""
+    h, w = image.shape[:2]
+    ratio = min(size / h, size / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_w, pad_h = (size - new_w) / 2, (size - new_h) / 2
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(
+        image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+    )
+    return image, ratio, (left, top)
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float,
+                        max_det: int) -> np.ndarray:
+    """Greedy NMS returning kept indices in descending score order"""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0 and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """YOLOv8 ONNX graph on ONNX Runtime (CPU or OpenVINO execution provider)"""
+
+    name = "onnx"
+
+    # Same defaults as ultralytics predict()
+    IOU_THRESHOLD = 0.7
+    MAX_DETECTIONS = 300
+    # Per-class box offset for class-aware NMS in a single pass
+    MAX_WH = 7680.0
+
+    def __init__(self, model_path: str, providers: Optional[List[str]] = None,
+                 intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 graph_optimization: str = "all"):
+        super().__init__(model_path)
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("onnxruntime is not installed; pip install onnxruntime")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        level_name = GRAPH_OPTIMIZATION_LEVELS.get(graph_optimization.lower(), "ORT_ENABLE_ALL")
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level_name)
+
+        available = ort.get_available_providers()
+        providers = [p for p in (providers or ["CPUExecutionProvider"]) if p in available]
+        if not providers:
+            providers = ["CPUExecutionProvider"]
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        self.providers = self.session.get_providers()
+        if "OpenVINOExecutionProvider" in self.providers:
+            self.name = "openvino"
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Dynamic axes come back as strings; fixed ones as ints
+        self.static_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+        self.static_size = model_input.shape[2] if isinstance(model_input.shape[2], int) else None
+
+    def predict(self, images: List[np.ndarray], conf_threshold: float, img_size: int) -> List[Detections]:
+        size = self.static_size or img_size
+        images = [np.asarray(image) for image in images]
+        prepared = [letterbox(image, size) for image in images]
+
+        batch_size = self.static_batch or len(prepared)
+        detections = []
+        for start in range(0, len(prepared), batch_size):
+            chunk = prepared[start:start + batch_size]
+            batch = np.stack([p[0] for p in chunk])
+            # NHWC uint8 -> NCHW float32 in [0, 1]
+            batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+            if self.static_batch and len(chunk) < self.static_batch:
+                filler = np.zeros((self.static_batch - len(chunk),) + batch.shape[1:], dtype=batch.dtype)
+                batch = np.concatenate([batch, filler])
+            outputs = self.session.run(None, {self.input_name: batch})[0][:len(chunk)]
+
+            for output, (_, ratio, pad), image in zip(outputs, chunk, images[start:start + batch_size]):
+                detections.append(
+                    # HWC array: (width, height) to clip boxes to
+                    self._postprocess(output, conf_threshold, ratio, pad, (image.shape[1], image.shape[0]))
+                )
+        return detections
+
+    def _postprocess(self, output: np.ndarray, conf_threshold: float, ratio: float,
+                     pad: Tuple[int, int], orig_size: Tuple[int, int]) -> Detections:
+        # YOLOv8 output: (4 + num_classes, anchors) with cx, cy, w, h first
+        pred = output.T
+        scores = pred[:, 4:]
+        cls = scores.argmax(axis=1)
+        conf = scores[np.arange(len(cls)), cls]
+
+        keep = conf > conf_threshold
+        if not keep.any():
+            return Detections.empty()
+        pred, cls, conf = pred[keep], cls[keep], conf[keep]
+
+        xy, wh = pred[:, :2], pred[:, 2:4]
+        xyxy = np.concatenate([xy - wh / 2, xy + wh / 2], axis=1)
+
+        keep = non_max_suppression(
+            xyxy + cls[:, None] * self.MAX_WH, conf, self.IOU_THRESHOLD, self.MAX_DETECTIONS
+        )
+        xyxy, conf, cls = xyxy[keep], conf[keep], cls[keep]
+
+        # Undo letterbox and clip to the original image
+        xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - pad[0]) / ratio).clip(0, orig_size[0])
+        xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - pad[1]) / ratio).clip(0, orig_size[1])
+
+        return Detections(xyxy.astype(np.float32), conf.astype(np.float32), cls.astype(np.int64))
+
+def export_onnx(model_path: str, onnx_path: str, img_size: int = 640) -> str:
+    """Export a YOLO .pt checkpoint to ONNX with dynamic batch and resolution"""
+    logger.info(f"Exporting {model_path} to ONNX")
+    exported = _yolo_class()(model_path).export(format="onnx", imgsz=img_size, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.makedirs(os.path.dirname(os.path.abspath(onnx_path)), exist_ok=True)
+        shutil.move(exported, onnx_path)
+    logger.info(f"ONNX model written to {onnx_path}")
+    return onnx_path
+
+def load_backend(model_path: str, backend: Optional[str] = None, img_size: int = 640,
+                 precision: Optional[str] = None) -> InferenceBackend:
+    """Load the model on the runtime selected by YOLO_BACKEND (torch, onnx or openvino)
+
+    YOLO_PRECISION=int8 serves the quantized ONNX artifact produced by
+    YOLOSignDetector.quantize_int8 (<model>_int8.onnx or ONNX_MODEL_PATH).
+    """
+    backend = (backend or os.environ.get('YOLO_BACKEND', 'torch')).lower()
+    precision = (precision or os.environ.get('YOLO_PRECISION', 'fp32')).lower()
+
+    if precision == 'int8' and backend == 'torch':
+        logger.warning("INT8 models are served through ONNX Runtime; switching backend to onnx")
+        backend = 'onnx'
+
+    if backend == 'torch':
+        return TorchBackend(model_path)
+
+    if backend not in ('onnx', 'openvino'):
+        raise ValueError(f"Unknown YOLO_BACKEND '{backend}'. Use torch, onnx or openvino")
+
+    if model_path.endswith('.onnx'):
+        onnx_path = model_path
+    elif precision == 'int8':
+        onnx_path = os.environ.get('ONNX_MODEL_PATH') or os.path.splitext(model_path)[0] + '_int8.onnx'
+        if not os.path.exists(onnx_path):
+            # Quantization needs calibration data, so it can't happen at load time
+            raise FileNotFoundError(
+                f"INT8 model not found: {onnx_path}. Create it with YOLOSignDetector.quantize_int8()"
+            )
+    else:
+        onnx_path = os.environ.get('ONNX_MODEL_PATH') or os.path.splitext(model_path)[0] + '.onnx'
+        if not os.path.exists(onnx_path):
+            export_onnx(model_path, onnx_path, img_size)
+
+    providers = ["CPUExecutionProvider"]
+    if backend == 'openvino':
+        providers = ["OpenVINOExecutionProvider", "CPUExecutionProvider"]
+
+    onnx_backend = OnnxRuntimeBackend(
+        onnx_path,
+        providers=providers,
+        intra_op_threads=int(os.environ.get('ORT_INTRA_OP_THREADS', '0')),
+        inter_op_threads=int(os.environ.get('ORT_INTER_OP_THREADS', '0')),
+        graph_optimization=os.environ.get('ORT_GRAPH_OPTIMIZATION', 'all')
+    )
+    onnx_backend.precision = precision
+    return onnx_backend
+
+def compare_backends(reference: InferenceBackend, candidate: InferenceBackend, image_paths: List[str],
+                     conf_threshold: float = 0.25, img_size: int = 640, iou_tolerance: float = 0.9) -> dict:
+    """Check that candidate's top detection matches reference's on each image"""
+    mismatches = []
+    timings = {reference.name: 0.0, candidate.name: 0.0}
+
+    for path in image_paths:
+        # Same input the server hands backends: a contiguous uint8 RGB array (DecodedImage.pixels)
+        image = np.ascontiguousarray(np.asarray(Image.open(path).convert('RGB')))
+        outputs = {}
+        for backend in (reference, candidate):
+            start = time.time()
+            outputs[backend.name] = backend.predict([image], conf_threshold, img_size)[0]
+            timings[backend.name] += time.time() - start
+
+        ref, cand = outputs[reference.name], outputs[candidate.name]
+        if len(ref) == 0 and len(cand) == 0:
+            continue
+        if len(ref) == 0 or len(cand) == 0:
+            mismatches.append({"image": path, "reason": "detection count", "reference": len(ref), "candidate": len(cand)})
+            continue
+
+        r, c = int(ref.conf.argmax()), int(cand.conf.argmax())
+        a, b = ref.xyxy[r], cand.xyxy[c]
+        inter = max(0.0, min(a[2], b[2]) - max(a[0], b[0])) * max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+        union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+        iou = inter / union if union > 0 else 0.0
+
+        if ref.cls[r] != cand.cls[c] or iou < iou_tolerance:
+            mismatches.append({
+                "image": path,
+                "reason": "top detection",
+                "reference": [int(ref.cls[r]), float(ref.conf[r])],
+                "candidate": [int(cand.cls[c]), float(cand.conf[c])],
+                "iou": round(float(iou), 4)
+            })
+
+    return {
+        "images": len(image_paths),
+        "mismatches": mismatches,
+        "avg_latency_ms": {
+            name: round(total / max(1, len(image_paths)) * 1000, 2) for name, total in timings.items()
+        }
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check an exported backend against the PyTorch model")
+    parser.add_argument("--model", required=True, help="Path to yolo_best.pt")
+    parser.add_argument("--images", required=True, help="Directory of test images")
+    parser.add_argument("--backend", default="onnx", choices=["onnx", "openvino"])
+    parser.add_argument("--img-size", type=int, default=640)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")) + glob.glob(os.path.join(args.images, "*.png")))
+    report = compare_backends(
+        load_backend(args.model, "torch"),
+        load_backend(args.model, args.backend, args.img_size),
+        paths,
+        img_size=args.img_size
+    )
+    print(report)
+    if report["mismatches"]:
+        raise SystemExit(1)
@@ -0,0 +1,128 @@
+import os
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any
+from ..utils.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+class InferenceQueueFullError(Exception):
+    """Raised when the inference admission queue is at capacity"""
+    pass
+
+class InferenceExecutor:
+    """Runs blocking model calls on a bounded worker pool off the event loop"""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.total_submitted = 0
+        self.total_completed = 0
+        self.total_rejected = 0
+        self.wait_times = deque(maxlen=1000)
+        self.run_times = deque(maxlen=1000)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="inference"
+            )
+            logger.info(
+                f"Inference executor started (workers={self.max_workers}, "
+                f"max_queue={self.max_queue})"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the worker pool, rejecting when saturated"""
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self.total_rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue full ({self._queued} waiting, {self._running} running)"
+                )
+            self._queued += 1
+            self.total_submitted += 1
+
+        submitted_at = time.time()
+
+        def _task():
+            started_at = time.time()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self.wait_times.append(started_at - submitted_at)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finished_at = time.time()
+                with self._lock:
+                    self._running -= 1
+                    self.total_completed += 1
+                    self.run_times.append(finished_at - started_at)
+
+        try:
+            future = self._get_executor().submit(_task)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        """Stop accepting work and wait for running tasks"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict:
+        """Get queue depth and wait time statistics"""
+        with self._lock:
+            wait_times = list(self.wait_times)
+            run_times = list(self.run_times)
+            stats = {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "total_submitted": self.total_submitted,
+                "total_completed": self.total_completed,
+                "total_rejected": self.total_rejected
+            }
+
+        stats["wait_time_ms"] = {
+            "p50": round(percentile(wait_times, 50) * 1000, 2),
+            "p95": round(percentile(wait_times, 95) * 1000, 2),
+            "max": round(max(wait_times) * 1000, 2) if wait_times else 0.0
+        }
+        stats["run_time_ms"] = {
+            "p50": round(percentile(run_times, 50) * 1000, 2),
+            "p95": round(percentile(run_times, 95) * 1000, 2)
+        }
+        return stats
+
+def _worker_count() -> int:
+    """INFERENCE_WORKERS, raised to BATCH_MAX_SIZE when micro-batching is on
+
+    A batched predict holds its worker until the scheduler resolves its frame, so
+    no batch can grow past the number of workers.
+    """
+    workers = int(os.environ.get('INFERENCE_WORKERS', '2'))
+    if os.environ.get('BATCH_INFERENCE_ENABLED', 'false').lower() == 'true':
+        workers = max(workers, int(os.environ.get('BATCH_MAX_SIZE', '8')))
+    return workers
+
+# Global inference executor instance
+inference_executor = InferenceExecutor(
+    max_workers=_worker_count(),
+    max_queue=int(os.environ.get('INFERENCE_MAX_QUEUE', '32'))
+)
@@ -0,0 +1,374 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 21 MediaPipe hand landmarks as (x, y), the layout data/preprocess.py trains on
+KEYPOINT_DIM = 42
+
+class KeypointExtractorUnavailableError(RuntimeError):
+    """Raised for image frames when MediaPipe isn't installed"""
+    pass
+
+def _import_sequence_models():
+    """Import ASLTCN/ASLLSTM from ml/src, which sits next to app/ in Docker and at the repo root locally"""
+    try:
+        from ml.src.models import ASLTCN, ASLLSTM, LSTMSessionStates
+    except ImportError:
+        here = os.path.dirname(os.path.abspath(__file__))
+        for root in (os.path.join(here, "..", ".."), os.path.join(here, "..", "..", "..")):
+            root = os.path.abspath(root)
+            if os.path.isdir(os.path.join(root, "ml", "src", "models")) and root not in sys.path:
+                sys.path.append(root)
+        from ml.src.models import ASLTCN, ASLLSTM, LSTMSessionStates
+    return ASLTCN, ASLLSTM, LSTMSessionStates
+
+def load_class_names(path: str) -> List[str]:
+    """Class names from a list, or from a {label: index} label_map.json"""
+    with open(path, 'r') as f:
+        labels = json.load(f)
+    if isinstance(labels, dict):
+        return [label for label, _ in sorted(labels.items(), key=lambda item: item[1])]
+    return list(labels)
+
+class KeypointWindow:
+    """Fixed-size ring buffer of per-frame hand keypoints for one session"""
+
+    def __init__(self, window: int = 30, session_id: Optional[str] = None):
+        self.window = window
+        self.session_id = session_id
+        self.buffer = np.zeros((window, KEYPOINT_DIM), dtype=np.float32)
+        self.frames_seen = 0
+        self.frames_since_eval = 0
+        self.lock = threading.Lock()
+        # Incremental TCN caches, the runner that built them, and the frames not yet folded in
+        # (the LSTM keeps its state in the runner, keyed by session_id)
+        self.stream_state = None
+        self.stream_owner = None
+        self.pending = deque(maxlen=window)
+
+    def push(self, keypoints: np.ndarray):
+        """Write one frame in place, overwriting the oldest once the window is full"""
+        self.buffer[self.frames_seen % self.window] = keypoints
+        self.pending.append(keypoints)
+        self.frames_seen += 1
+        self.frames_since_eval += 1
+
+    @property
+    def filled(self) -> int:
+        return min(self.frames_seen, self.window)
+
+    def ordered(self) -> np.ndarray:
+        """The window oldest-first; short streams are zero-padded at the end like training clips"""
+        if self.frames_seen <= self.window:
+            return self.buffer.copy()
+        return np.roll(self.buffer, -(self.frames_seen % self.window), axis=0)
+
+    def clear(self):
+        self.buffer.fill(0.0)
+        self.frames_seen = 0
+        self.frames_since_eval = 0
+        self.stream_state = None
+        self.stream_owner = None
+        self.pending.clear()
+
+class SequenceModelRunner:
+    """ASLTCN or ASLLSTM checkpoint (state_dict) scoring batches of keypoint windows on CPU"""
+
+    def __init__(self, model_path: str, model_type: str, num_classes: int, threads: int = 0,
+                 window: int = 30, incremental: bool = True):
+        import torch
+        ASLTCN, ASLLSTM, LSTMSessionStates = _import_sequence_models()
+
+        self.torch = torch
+        self.model_type = model_type.lower()
+        if self.model_type == "tcn":
+            model = ASLTCN(input_channels=KEYPOINT_DIM, num_classes=num_classes)
+        elif self.model_type == "lstm":
+            model = ASLLSTM(input_size=KEYPOINT_DIM, num_classes=num_classes)
+        else:
+            raise ValueError(f"Unknown KEYPOINT_MODEL_TYPE '{model_type}'. Use tcn or lstm")
+
+        model.load_state_dict(torch.load(model_path, map_location="cpu"))
+        self.model = model.eval()
+        self.model_path = model_path
+        # Consecutive windows share all but `stride` frames; the TCN can reuse cached activations
+        self.streaming = model.streaming(window) if self.model_type == "tcn" and incremental else None
+        # The LSTM instead carries (h, c) across the whole stream, one frame per step
+        self.sessions = LSTMSessionStates(model) if self.model_type == "lstm" and incremental else None
+        if threads > 0:
+            torch.set_num_threads(threads)
+
+    def predict(self, windows: np.ndarray) -> np.ndarray:
+        """Class probabilities for a (batch, window, 42) array in one forward pass"""
+        with self.torch.inference_mode():
+            logits = self.model(self.torch.from_numpy(np.ascontiguousarray(windows, dtype=np.float32)))
+            return self.torch.softmax(logits, dim=1).numpy()
+
+    def advance(self, states: List, frames: List[List[np.ndarray]]) -> np.ndarray:
+        """Fold each session's new frames into its incremental TCN caches, then score the windows"""
+        with self.torch.no_grad():
+            for step in range(max(len(session_frames) for session_frames in frames)):
+                active = [i for i, session_frames in enumerate(frames) if step < len(session_frames)]
+                self.streaming.step(
+                    [states[i] for i in active],
+                    self.torch.from_numpy(np.stack([frames[i][step] for i in active]).astype(np.float32))
+                )
+            return self.torch.softmax(self.streaming.readout(states), dim=1).numpy()
+
+    def step_sessions(self, session_ids: List[str], frames: List[List[np.ndarray]]) -> np.ndarray:
+        """Step each session's LSTM state through its new frames; probabilities after each one's last frame"""
+        probabilities = [None] * len(session_ids)
+        with self.torch.no_grad():
+            for step in range(max(len(session_frames) for session_frames in frames)):
+                active = [i for i, session_frames in enumerate(frames) if step < len(session_frames)]
+                logits = self.sessions.step(
+                    [session_ids[i] for i in active],
+                    self.torch.from_numpy(np.stack([frames[i][step] for i in active]).astype(np.float32))
+                )
+                scores = self.torch.softmax(logits, dim=1).numpy()
+                for row, i in enumerate(active):
+                    if step == len(frames[i]) - 1:
+                        probabilities[i] = scores[row]
+        return np.stack(probabilities)
+
+    @property
+    def incremental(self) -> bool:
+        return self.streaming is not None or self.sessions is not None
+
+class HandKeypointExtractor:
+    """MediaPipe Hands keypoints from RGB frames, one Hands instance per worker thread"""
+
+    def __init__(self, min_detection_confidence: float = 0.5):
+        import mediapipe as mp
+        self.mp_hands = mp.solutions.hands
+        self.min_detection_confidence = min_detection_confidence
+        self._local = threading.local()
+
+    def extract(self, pixels: np.ndarray) -> Optional[np.ndarray]:
+        """42 keypoint values for the first hand, or None when no hand is found"""
+        hands = getattr(self._local, "hands", None)
+        if hands is None:
+            # Same settings preprocess.py extracted the training data with
+            hands = self.mp_hands.Hands(
+                static_image_mode=True, max_num_hands=1,
+                min_detection_confidence=self.min_detection_confidence
+            )
+            self._local.hands = hands
+        results = hands.process(pixels)
+        if not results.multi_hand_landmarks:
+            return None
+        landmarks = results.multi_hand_landmarks[0].landmark
+        return np.array([coord for point in landmarks for coord in (point.x, point.y)], dtype=np.float32)
+
+class KeypointRecognizer:
+    """Streaming word recognizer over per-session sliding windows of hand keypoints
+
+    Each session keeps a ring buffer of the last `window` frames. Every `stride` new
+    frames the current window is scored; windows from concurrent sessions share one
+    forward pass through the batch scheduler. With the TCN, sessions keep incremental
+    caches instead, so an evaluation only runs the layers over the new frames.
+    """
+
+    def __init__(self, scheduler, window: int = 30, stride: int = 5, min_frames: Optional[int] = None,
+                 top_k: int = 3):
+        self.window = window
+        self.stride = max(1, stride)
+        self.min_frames = min(window, min_frames or window)
+        self.top_k = top_k
+        self.runner = None
+        self.class_names: List[str] = []
+        self.extractor = None
+        # BatchInferenceScheduler over score_windows
+        self.scheduler = scheduler
+        self._stats_lock = threading.Lock()
+        self.frames_received = 0
+        self.windows_evaluated = 0
+        self.windows_empty = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.runner is not None
+
+    def load(self, model_path: str, class_names_path: str, model_type: str = "tcn", threads: int = 0,
+             incremental: bool = True):
+        """Load the sequence model checkpoint and its label map"""
+        start_time = time.time()
+        class_names = load_class_names(class_names_path)
+        runner = SequenceModelRunner(
+            model_path, model_type, len(class_names), threads, window=self.window, incremental=incremental
+        )
+        # Warm up the graph at the batch shapes traffic will use
+        runner.predict(np.zeros((1, self.window, KEYPOINT_DIM), dtype=np.float32))
+        if runner.streaming is not None:
+            runner.advance(
+                [runner.streaming.init_state()], [list(np.zeros((self.window, KEYPOINT_DIM), dtype=np.float32))]
+            )
+        if runner.sessions is not None:
+            runner.step_sessions(["warmup"], [[np.zeros(KEYPOINT_DIM, dtype=np.float32)]])
+            runner.sessions.remove("warmup")
+        self.class_names = class_names
+        self.runner = runner
+        logger.info(
+            f"✅ Keypoint {runner.model_type.upper()} loaded from {model_path} "
+            f"({len(class_names)} classes, incremental={runner.incremental}) "
+            f"in {time.time() - start_time:.2f}s"
+        )
+
+    def get_extractor(self) -> HandKeypointExtractor:
+        """Lazily create the MediaPipe extractor used for image frames"""
+        if self.extractor is None:
+            try:
+                self.extractor = HandKeypointExtractor()
+            except ImportError:
+                raise KeypointExtractorUnavailableError(
+                    "mediapipe is not installed; send keypoints to /keypoints/stream instead"
+                )
+        return self.extractor
+
+    @staticmethod
+    def score_windows(windows: List, conf_threshold: float, window: int,
+                      runner: SequenceModelRunner) -> List[np.ndarray]:
+        """Batch scheduler callback: one forward pass over windows from many sessions
+
+        Incremental runners get (stream_state or session_id, new_frames) pairs instead of full windows.
+        """
+        if runner.streaming is not None:
+            return list(runner.advance([item[0] for item in windows], [item[1] for item in windows]))
+        if runner.sessions is not None:
+            return list(runner.step_sessions([item[0] for item in windows], [item[1] for item in windows]))
+        return list(runner.predict(np.stack(windows)))
+
+    def _stream_inputs(self, state: KeypointWindow, runner: SequenceModelRunner):
+        """The session's incremental TCN state and the frames it hasn't folded in yet"""
+        if state.stream_owner is not runner or len(state.pending) >= self.window:
+            # New session, reloaded model, or more new frames than the window holds:
+            # rebuild from the window itself, which gives the same caches
+            state.stream_state = runner.streaming.init_state()
+            state.stream_owner = runner
+            frames = list(state.ordered()[:state.filled])
+        else:
+            frames = list(state.pending)
+        state.pending.clear()
+        return state.stream_state, frames
+
+    def push(self, state: KeypointWindow, frames: List[Optional[np.ndarray]]) -> Optional[Dict]:
+        """Append frames (None = no hand) and score the window once `stride` new frames arrived
+
+        Returns the recognition, or None when no evaluation was due.
+        """
+        runner = self.runner
+        with state.lock:
+            for keypoints in frames:
+                state.push(np.zeros(KEYPOINT_DIM, dtype=np.float32) if keypoints is None else keypoints)
+            with self._stats_lock:
+                self.frames_received += len(frames)
+            if state.filled < self.min_frames or state.frames_since_eval < self.stride:
+                return None
+            state.frames_since_eval = 0
+
+            start_time = time.time()
+            if not state.buffer.any():
+                # No hand anywhere in the window; nothing for the model to recognize
+                with self._stats_lock:
+                    self.windows_empty += 1
+                if runner.sessions is not None:
+                    # The sign is over; the next one starts from a fresh LSTM state
+                    runner.sessions.reset(self._session_key(state))
+                    state.pending.clear()
+                return self._format(None, start_time, {"batch_size": 0, "queue_wait": 0.0}, state)
+
+            # Incremental state is mutated by the scheduler, so the session's evaluation stays under its lock
+            if runner.streaming is not None:
+                return self._score(self._stream_inputs(state, runner), runner, start_time, state)
+            if runner.sessions is not None:
+                # Frames beyond the last `window` were dropped from pending; the LSTM skips them
+                frames = list(state.pending)
+                state.pending.clear()
+                return self._score((self._session_key(state), frames), runner, start_time, state)
+            window = state.ordered()
+
+        return self._score(window, runner, start_time, state)
+
+    @staticmethod
+    def _session_key(state: KeypointWindow):
+        return state.session_id if state.session_id is not None else id(state)
+
+    def release(self, session_id: str):
+        """Drop a session's LSTM state once the session ends or is evicted"""
+        runner = self.runner
+        if runner is not None and runner.sessions is not None:
+            runner.sessions.remove(session_id)
+
+    def _score(self, item, runner: SequenceModelRunner, start_time: float, state: KeypointWindow) -> Dict:
+        """Submit one window (or incremental update) to the batch scheduler and format the result"""
+        batched = self.scheduler.submit(item, 0.0, self.window, runner).result()
+        with self._stats_lock:
+            self.windows_evaluated += 1
+        batch_info = {
+            "batch_size": batched["batch_size"],
+            "queue_wait": round(batched["queue_wait"], 4)
+        }
+        return self._format(batched["result"], start_time, batch_info, state)
+
+    def _format(self, probabilities: Optional[np.ndarray], start_time: float, batch_info: Dict,
+                state: KeypointWindow) -> Dict:
+        """Recognition in the detection shape SentenceBuilder reads"""
+        detections = []
+        if probabilities is not None:
+            top = np.argsort(-probabilities)[:self.top_k]
+            detections = [
+                {
+                    "class": self.class_names[index] if index < len(self.class_names) else f"class_{index}",
+                    "confidence": float(probabilities[index]),
+                    "bbox": None
+                }
+                for index in top
+            ]
+        return {
+            "detections": detections,
+            "predicted_class": detections[0]["class"] if detections else "no_detection",
+            "confidence": detections[0]["confidence"] if detections else 0.0,
+            "window_frames": state.filled,
+            "frames_seen": state.frames_seen,
+            "inference_time": round(time.time() - start_time, 4),
+            "batch_info": batch_info
+        }
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "loaded": self.is_loaded,
+                "model_type": self.runner.model_type if self.runner else None,
+                "model_path": self.runner.model_path if self.runner else None,
+                "incremental": self.runner.incremental if self.runner else False,
+                "lstm_sessions": len(self.runner.sessions) if self.runner and self.runner.sessions is not None else None,
+                "num_classes": len(self.class_names),
+                "window": self.window,
+                "stride": self.stride,
+                "min_frames": self.min_frames,
+                "frames_received": self.frames_received,
+                "windows_evaluated": self.windows_evaluated,
+                "windows_empty": self.windows_empty,
+                "batching": self.scheduler.get_stats()
+            }
+
+def parse_keypoint_frames(frames: Union[List, np.ndarray]) -> List[Optional[np.ndarray]]:
+    """Validate client keypoints: a list of frames, each 42 floats or null for no hand"""
+    parsed = []
+    for frame in frames:
+        if frame is None:
+            parsed.append(None)
+            continue
+        keypoints = np.asarray(frame, dtype=np.float32).reshape(-1)
+        if keypoints.shape[0] != KEYPOINT_DIM:
+            raise ValueError(f"Each keypoint frame needs {KEYPOINT_DIM} values, got {keypoints.shape[0]}")
+        parsed.append(keypoints)
+    return parsed
@@ -0,0 +1,186 @@
+import os
+import json
+import random
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from ..utils.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+class UnknownModelError(Exception):
+    """Raised when a request names a model the registry doesn't have"""
+    pass
+
+class ModelUnavailableError(Exception):
+    """Raised when a registered model isn't loaded (startup or a failed load)"""
+    pass
+
+class ModelBusyError(Exception):
+    """Raised when a model is at its concurrency limit for longer than the queue timeout"""
+    pass
+
+class ModelEntry:
+    """A named model in the registry with its routing weight, concurrency limit and latency stats"""
+
+    def __init__(self, name: str, model_path: Optional[str] = None, class_names_path: Optional[str] = None,
+                 backend: Optional[str] = None, precision: Optional[str] = None, weight: float = 0.0,
+                 max_concurrency: int = 0, warmup_runs: Optional[int] = None):
+        self.name = name
+        # Load spec; None falls back to the service defaults
+        self.model_path = model_path
+        self.class_names_path = class_names_path
+        self.backend = backend
+        self.precision = precision
+        self.warmup_runs = warmup_runs
+        self.weight = max(0.0, weight)
+        self.max_concurrency = max(0, max_concurrency)
+        # The serving LoadedModel; replaced as a unit on reload
+        self.loaded = None
+        self.load_error = None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency) if self.max_concurrency else None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=1000)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.loaded.version if self.loaded else None
+
+    @contextmanager
+    def acquire(self, timeout: float):
+        """Hold one of the model's concurrency slots for the duration of a request"""
+        if self._slots is not None and not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self.rejected += 1
+            raise ModelBusyError(
+                f"Model '{self.name}' is at its concurrency limit ({self.max_concurrency})"
+            )
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    def record(self, latency: float, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            else:
+                self.latencies.append(latency)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                "name": self.name,
+                "loaded": self.loaded is not None,
+                "version": self.version,
+                "backend": self.loaded.backend.name if self.loaded else self.backend,
+                "model_path": self.loaded.model_path if self.loaded else self.model_path,
+                "num_classes": len(self.loaded.class_names) if self.loaded else 0,
+                "load_error": self.load_error,
+                "weight": self.weight,
+                "max_concurrency": self.max_concurrency or None,
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "latency_ms": {
+                    "p50": round(percentile(latencies, 50) * 1000, 2),
+                    "p95": round(percentile(latencies, 95) * 1000, 2),
+                    "p99": round(percentile(latencies, 99) * 1000, 2),
+                    "samples": len(latencies)
+                }
+            }
+
+class ModelRegistry:
+    """Named models served side by side, with explicit selection or weighted traffic splitting"""
+
+    def __init__(self, primary: ModelEntry, acquire_timeout: float = 0.1):
+        self.primary = primary
+        self.acquire_timeout = acquire_timeout
+        self._entries = {primary.name: primary}
+        self._lock = threading.Lock()
+
+    def register(self, entry: ModelEntry) -> ModelEntry:
+        with self._lock:
+            if entry.name in self._entries:
+                raise ValueError(f"Model '{entry.name}' is already registered")
+            self._entries[entry.name] = entry
+        return entry
+
+    def get(self, name: str) -> ModelEntry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise UnknownModelError(f"Unknown model '{name}'. Available: {', '.join(self.names())}")
+        return entry
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def entries(self) -> List[ModelEntry]:
+        return list(self._entries.values())
+
+    def route(self, name: Optional[str] = None) -> ModelEntry:
+        """The requested model, else a weighted pick among loaded models, else the primary"""
+        if name:
+            entry = self.get(name)
+            if entry.loaded is None:
+                raise ModelUnavailableError(f"Model '{name}' is not loaded")
+            return entry
+
+        candidates = [entry for entry in self._entries.values() if entry.loaded is not None and entry.weight > 0]
+        if not candidates:
+            return self.primary
+        if len(candidates) == 1:
+            return candidates[0]
+        return random.choices(candidates, weights=[entry.weight for entry in candidates])[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Per-model routing, concurrency and latency stats"""
+        entries = self.entries()
+        total_weight = sum(entry.weight for entry in entries if entry.loaded is not None)
+        stats = {}
+        for entry in entries:
+            stats[entry.name] = entry.get_stats()
+            stats[entry.name]["traffic_share"] = (
+                round(entry.weight / total_weight, 4) if entry.loaded is not None and total_weight else 0.0
+            )
+        return stats
+
+def read_registry_config(config_path: str) -> List[ModelEntry]:
+    """Parse MODEL_REGISTRY_CONFIG: {"models": [{"name", "model_path", "class_names_path", ...}]}"""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(config_path))
+    entries = []
+    for spec in config.get("models", []):
+        if not spec.get("name") or not spec.get("model_path") or not spec.get("class_names_path"):
+            raise ValueError(f"Registry entry needs name, model_path and class_names_path: {spec}")
+        entries.append(ModelEntry(
+            spec["name"],
+            # Relative paths are relative to the config file
+            model_path=os.path.join(base_dir, spec["model_path"]),
+            class_names_path=os.path.join(base_dir, spec["class_names_path"]),
+            backend=spec.get("backend"),
+            precision=spec.get("precision"),
+            weight=float(spec.get("weight", 0.0)),
+            max_concurrency=int(spec.get("max_concurrency", 0)),
+            warmup_runs=spec.get("warmup_runs")
+        ))
+    return entries
@@ -1,13 +1,25 @@
 import os
 import json
-import io
 import logging
 import time
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
 from PIL import Image
-from typing import Union, Dict
-from ultralytics import YOLO
-from collections import deque
+import numpy as np
+import cv2
+from typing import Union, Dict, List, Callable, Optional
+from collections import deque, Counter
 from datetime import datetime
+from .session_store import SessionStore, create_session_backend
+from .inference_backends import load_backend, Detections
+from .prediction_cache import PredictionCache
+from .keypoint_recognizer import KeypointRecognizer, KeypointWindow
+from .model_registry import (
+    ModelEntry, ModelRegistry, UnknownModelError, ModelUnavailableError, read_registry_config
+)
+from ..utils.stats import percentile
+from ..utils.image_decode import DecodedImage, decode_image
 
 logger = logging.getLogger(__name__)
 
@@ -28,19 +40,7 @@ class SentenceBuilder:
     def add_prediction(self, prediction: Dict) -> Dict:
         """Add a new prediction and update sentence if stable"""
         current_time = datetime.now()
-        
-        # Extract the best prediction
-        if prediction["detections"] and len(prediction["detections"]) > 0:
-            best_detection = prediction["detections"][0]
-            predicted_class = best_detection["class"]
-            confidence = best_detection["confidence"]
-        else:
-            predicted_class = "no_detection"
-            confidence = 0.0
-        
-        # Only consider predictions above minimum confidence
-        if confidence < self.min_confidence:
-            predicted_class = "no_detection"
+        predicted_class, confidence = self._best_class(prediction)
         
         # Add to buffer
         self.predictions_buffer.append({
@@ -71,6 +71,28 @@ class SentenceBuilder:
                         
                         logger.info(f"Added word to sentence: {stable_class}")
         
+        return self._summary(predicted_class, confidence)
+    
+    def report_prediction(self, prediction: Dict) -> Dict:
+        """Same response as add_prediction, without buffering the prediction"""
+        return self._summary(*self._best_class(prediction))
+    
+    def _best_class(self, prediction: Dict):
+        # Extract the best prediction
+        if prediction["detections"] and len(prediction["detections"]) > 0:
+            best_detection = prediction["detections"][0]
+            predicted_class = best_detection["class"]
+            confidence = best_detection["confidence"]
+        else:
+            predicted_class = "no_detection"
+            confidence = 0.0
+        
+        # Only consider predictions above minimum confidence
+        if confidence < self.min_confidence:
+            predicted_class = "no_detection"
+        return predicted_class, confidence
+    
+    def _summary(self, predicted_class: str, confidence: float) -> Dict:
         # Build current sentence text
         sentence_text = " ".join(self.current_sentence)
         
@@ -101,92 +123,729 @@ class SentenceBuilder:
             "last_prediction_time": self.last_prediction_time.isoformat() if self.last_prediction_time else None,
             "session_duration": (datetime.now() - self.session_start_time).total_seconds()
         }
+    
+    def to_state(self) -> Dict:
+        """Serialize builder state to a compact JSON-safe dict"""
+        return {
+            "b": [
+                [p["class"], round(p["confidence"], 4), p["timestamp"].timestamp()]
+                for p in self.predictions_buffer
+            ],
+            "s": self.current_sentence,
+            "w": self.last_stable_prediction,
+            "t": self.last_prediction_time.timestamp() if self.last_prediction_time else None,
+            "st": self.stability_threshold,
+            "mc": self.min_confidence,
+            "ss": self.session_start_time.timestamp()
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> "SentenceBuilder":
+        """Rebuild a builder from to_state() output"""
+        builder = cls(stability_threshold=state["st"], min_confidence=state["mc"])
+        builder.predictions_buffer.extend(
+            {"class": c, "confidence": conf, "timestamp": datetime.fromtimestamp(ts)}
+            for c, conf, ts in state["b"]
+        )
+        builder.current_sentence = list(state["s"])
+        builder.last_stable_prediction = state["w"]
+        builder.last_prediction_time = datetime.fromtimestamp(state["t"]) if state["t"] is not None else None
+        builder.session_start_time = datetime.fromtimestamp(state["ss"])
+        return builder
+
+class BatchInferenceScheduler:
+    """Collects frames from concurrent callers into batched YOLO forward passes"""
+
+    def __init__(self, infer_fn: Callable, max_batch_size: int = 8, max_wait_ms: float = 5.0,
+                 name: str = "yolo-batch-scheduler"):
+        self.infer_fn = infer_fn
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._running = False
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_batches = 0
+        self.batch_size_counts = Counter()
+        self.latencies = deque(maxlen=1000)
+        self.queue_waits = deque(maxlen=1000)
+
+    def start(self):
+        """Start the background batching thread"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+        logger.info(
+            f"Batch scheduler {self.name} started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait_ms})"
+        )
+
+    def stop(self):
+        """Stop the background thread, failing any frames still queued"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].set_exception(RuntimeError("Batch scheduler stopped"))
+
+    def submit(self, image: DecodedImage, conf_threshold: float, img_size: int, model) -> Future:
+        """Queue a frame for the next batch and return a future for its result"""
+        if not self._running:
+            self.start()
+        future = Future()
+        self._queue.put((future, image, conf_threshold, time.time(), img_size, model))
+        return future
+
+    def _collect_batch(self, first_item) -> List:
+        """Gather up to max_batch_size frames, waiting at most max_wait_ms"""
+        batch = [first_item]
+        deadline = time.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Re-queue the stop sentinel so the run loop sees it
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """Main loop: pull a batch, run one forward pass, resolve each future"""
+        while self._running:
+            item = self._queue.get()
+            if item is None:
+                continue
+
+            collected = [item]
+            try:
+                collected = self._collect_batch(item)
+                # Frames at different input resolutions (or submitted to different model
+                # generations during a hot swap) can't share a forward pass
+                groups = {}
+                for b in collected:
+                    groups.setdefault((b[4], b[5]), []).append(b)
+                for (img_size, model), batch in groups.items():
+                    self._run_batch(batch, img_size, model)
+            except Exception as e:
+                # Never let the thread die: later submit()s would wait on it forever
+                logger.error(f"Batch scheduler {self.name} failed: {str(e)}")
+                self._fail(collected, e)
+
+    @staticmethod
+    def _fail(batch: List, error: BaseException):
+        """Resolve every still-pending future in batch with error"""
+        for b in batch:
+            if not b[0].done():
+                try:
+                    b[0].set_exception(error)
+                except InvalidStateError:
+                    pass
+
+    def _run_batch(self, batch: List, img_size: int, model):
+        """Run one forward pass for frames sharing an input resolution and model"""
+        try:
+            images = [b[1] for b in batch]
+            # Run at the loosest threshold; callers filter to their own afterwards
+            conf_threshold = min(b[2] for b in batch)
+            batch_start = time.time()
+
+            results = list(self.infer_fn(images, conf_threshold, img_size, model))
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batched inference returned {len(results)} results for {len(batch)} frames"
+                )
+
+            batch_end = time.time()
+            batch_size = len(batch)
+
+            with self._lock:
+                self.total_batches += 1
+                self.total_requests += batch_size
+                self.batch_size_counts[batch_size] += 1
+                for b in batch:
+                    self.queue_waits.append(batch_start - b[3])
+                    self.latencies.append(batch_end - b[3])
+
+            for b, result in zip(batch, results):
+                b[0].set_result({
+                    "result": result,
+                    "batch_size": batch_size,
+                    "queue_wait": batch_start - b[3],
+                    "batch_inference_time": batch_end - batch_start
+                })
+        except Exception as e:
+            logger.error(f"Batched inference failed: {str(e)}")
+            self._fail(batch, e)
+
+    def get_stats(self) -> Dict:
+        """Get batching statistics for tuning max_batch_size / max_wait_ms"""
+        with self._lock:
+            latencies = list(self.latencies)
+            queue_waits = list(self.queue_waits)
+            total_batches = self.total_batches
+            total_requests = self.total_requests
+            batch_size_counts = dict(sorted(self.batch_size_counts.items()))
+
+        return {
+            "running": self._running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queued": self._queue.qsize(),
+            "total_requests": total_requests,
+            "total_batches": total_batches,
+            "avg_batch_size": round(total_requests / total_batches, 2) if total_batches else 0.0,
+            "batch_size_histogram": {str(k): v for k, v in batch_size_counts.items()},
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 2),
+                "p95": round(percentile(latencies, 95) * 1000, 2),
+                "p99": round(percentile(latencies, 99) * 1000, 2)
+            },
+            "queue_wait_ms": {
+                "p50": round(percentile(queue_waits, 50) * 1000, 2),
+                "p95": round(percentile(queue_waits, 95) * 1000, 2)
+            }
+        }
+
+class AdaptiveResolution:
+    """Per-session input size that steps down while detections stay confident"""
+    
+    def __init__(self, levels: List[int], high_confidence: float = 0.7,
+                 low_confidence: float = 0.45, patience: int = 5):
+        self.levels = sorted(levels)
+        self.index = len(self.levels) - 1  # Start at full resolution
+        self.high_confidence = high_confidence
+        self.low_confidence = low_confidence
+        self.patience = patience
+        self.confident_streak = 0
+        self.changes = 0
+    
+    @property
+    def img_size(self) -> int:
+        return self.levels[self.index]
+    
+    def update(self, confidence: float) -> Optional[str]:
+        """Feed the top detection confidence; returns 'down'/'up' when the size changes"""
+        if confidence >= self.high_confidence:
+            self.confident_streak += 1
+            if self.confident_streak >= self.patience and self.index > 0:
+                self.index -= 1
+                self.confident_streak = 0
+                self.changes += 1
+                return "down"
+        elif confidence < self.low_confidence:
+            self.confident_streak = 0
+            if self.index < len(self.levels) - 1:
+                self.index += 1
+                self.changes += 1
+                return "up"
+        else:
+            self.confident_streak = 0
+        return None
+
+class StreamState:
+    """Process-local per-session state for the streaming fast paths"""
+    
+    def __init__(self):
+        self.resolution = None
+        self.roi_bbox = None
+        self.frames_since_full = 0
+        self.reference_thumbnail = None
+        self.last_prediction = None
+        self.last_conf_threshold = None
+        self.last_diff = None
+        self.consecutive_skips = 0
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        # Registry model picked for this session; kept so a stream never switches mid-sentence
+        self.model_name = None
+        # Ring buffer of hand keypoints for the sequence recognizer
+        self.keypoints = None
+
+class ModelReloadInProgressError(Exception):
+    """Raised when a model swap is requested while another one is still loading"""
+    pass
+
+class LoadedModel:
+    """One model generation (backend, class names, version), swapped in as a unit"""
+    
+    def __init__(self, backend, class_names: List[str], model_path: str, class_names_path: str,
+                 version: str, generation: int, load_time: float, name: Optional[str] = None):
+        self.name = name
+        self.backend = backend
+        self.class_names = class_names
+        self.class_lookup = np.array(class_names, dtype=object)
+        self.model_path = model_path
+        self.class_names_path = class_names_path
+        self.version = version
+        self.generation = generation
+        self.load_time = load_time
+        self.warmup_time = None
+    
+    def class_name_lookup(self, class_ids: np.ndarray) -> np.ndarray:
+        """Map class indices to names, growing the lookup with class_<idx> for unknown ids"""
+        if len(class_ids) and class_ids.max() >= len(self.class_lookup):
+            extra = [f"class_{idx}" for idx in range(len(self.class_lookup), int(class_ids.max()) + 1)]
+            self.class_lookup = np.concatenate([self.class_lookup, np.array(extra, dtype=object)])
+        return self.class_lookup[class_ids]
 
 class ModelService:
     """Service for handling YOLO model operations with sentence building"""
     
     def __init__(self):
-        self.model = None
-        self.class_names = []
         self.img_size = 640
-        self.is_loaded = False
-        self.model_path = None
-        self.load_time = None
-        self.sentence_builders = {}
+        self.backend_name = os.environ.get('YOLO_BACKEND', 'torch').lower()
+        # Named models; the primary one is what `active` serves and what /model/reload swaps
+        self.registry = ModelRegistry(
+            ModelEntry(
+                os.environ.get('MODEL_NAME', 'default'),
+                weight=float(os.environ.get('MODEL_WEIGHT', '1.0')),
+                max_concurrency=int(os.environ.get('MODEL_MAX_CONCURRENCY', '0'))
+            ),
+            acquire_timeout=float(os.environ.get('MODEL_QUEUE_TIMEOUT_MS', '100')) / 1000.0
+        )
+        self.warmup_runs = int(os.environ.get('MODEL_WARMUP_RUNS', '3'))
+        self._reload_lock = threading.Lock()
+        self.generation = 0
+        self.last_reload = None
+        # Sentence state lives in a pluggable backend (SESSION_BACKEND=memory|sqlite)
+        self.sentence_builders = create_session_backend(SentenceBuilder)
+        # Per-session caches (resolution policy etc.) only need to live in this process
+        self.stream_states = SessionStore(
+            ttl_seconds=float(os.environ.get('SESSION_TTL_SECONDS', '600')),
+            max_sessions=int(os.environ.get('SESSION_MAX_COUNT', '1000')),
+            sweep_interval=float(os.environ.get('SESSION_SWEEP_INTERVAL', '60'))
+        )
+        self.sentence_builders.add_eviction_listener(
+            lambda session_id, reason: self.stream_states.delete(session_id)
+        )
+        
+        # Adaptive input resolution for streaming sessions
+        self.adaptive_resolution = os.environ.get('ADAPTIVE_RESOLUTION', 'false').lower() == 'true'
+        self.resolution_levels = [
+            int(size) for size in os.environ.get('ADAPTIVE_RESOLUTION_LEVELS', '320,416,512,640').split(',')
+        ]
+        self.img_size_counts = Counter()
+        self._stats_lock = threading.Lock()
+        
+        # Region-of-interest tracking around the previous hand bbox
+        self.roi_tracking = os.environ.get('ROI_TRACKING', 'false').lower() == 'true'
+        self.roi_expand = float(os.environ.get('ROI_EXPAND', '2.0'))
+        self.roi_min_size = int(os.environ.get('ROI_MIN_SIZE', '160'))
+        self.roi_refresh_frames = int(os.environ.get('ROI_REFRESH_FRAMES', '15'))
+        self.roi_counts = Counter()
+        
+        # The sentence builder only reads the top detection of a stream frame
+        self.stream_max_detections = int(os.environ.get('STREAM_MAX_DETECTIONS', '1')) or None
+        
+        # Let libjpeg decode large uploads at a reduced scale near img_size
+        self.reduced_decode = os.environ.get('REDUCED_JPEG_DECODE', 'true').lower() == 'true'
+        
+        # Reuse the previous result for near-duplicate stream frames
+        self.frame_skip = os.environ.get('FRAME_SKIP', 'false').lower() == 'true'
+        self.frame_diff_threshold = float(os.environ.get('FRAME_DIFF_THRESHOLD', '2.0'))
+        self.frame_max_skip = int(os.environ.get('FRAME_MAX_SKIP', '5'))
+        # Sentence stability counts frames, so by default an unchanged frame still counts
+        # as another frame of the held sign; false reports the sentence without adding to it
+        self.frame_skip_feeds_sentence = os.environ.get('FRAME_SKIP_FEEDS_SENTENCE', 'true').lower() == 'true'
+        self.frames_skipped = 0
+        self.frames_inferred = 0
+        
+        # Dynamic micro-batching across concurrent requests
+        self.batching_enabled = os.environ.get('BATCH_INFERENCE_ENABLED', 'false').lower() == 'true'
+        self.batch_scheduler = BatchInferenceScheduler(
+            self._infer_batch,
+            max_batch_size=int(os.environ.get('BATCH_MAX_SIZE', '8')),
+            max_wait_ms=float(os.environ.get('BATCH_MAX_WAIT_MS', '5'))
+        )
+        
+        # Content-addressed cache of /predict responses for repeated image bytes
+        self.prediction_cache_enabled = os.environ.get('PREDICTION_CACHE', 'false').lower() == 'true'
+        self.prediction_cache = PredictionCache(
+            max_entries=int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', '1024')),
+            max_bytes=int(float(os.environ.get('PREDICTION_CACHE_MAX_MB', '64')) * 1024 * 1024)
+        )
+        
+        # Explicit multi-image requests: parallel decode, then chunked forward passes
+        self.decode_pool = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('DECODE_WORKERS', '4')),
+            thread_name_prefix="decode"
+        )
+        self.batch_chunk_size = int(os.environ.get('PREDICT_BATCH_CHUNK', '16'))
+        
+        # Temporal keypoint model (ASLTCN/ASLLSTM) over sliding per-session windows
+        self.keypoint_recognizer = KeypointRecognizer(
+            BatchInferenceScheduler(
+                KeypointRecognizer.score_windows,
+                max_batch_size=int(os.environ.get('KEYPOINT_BATCH_MAX_SIZE', '32')),
+                max_wait_ms=float(os.environ.get('KEYPOINT_BATCH_MAX_WAIT_MS', '5')),
+                name="keypoint-batch-scheduler"
+            ),
+            window=int(os.environ.get('KEYPOINT_WINDOW', '30')),
+            stride=int(os.environ.get('KEYPOINT_STRIDE', '5')),
+            min_frames=int(os.environ.get('KEYPOINT_MIN_FRAMES', '0')) or None
+        )
+        # Stateful LSTM sessions end with their stream state
+        self.stream_states.add_eviction_listener(
+            lambda session_id, reason: self.keypoint_recognizer.release(session_id)
+        )
     
-    def load_model(self, model_path: str = None, class_names_path: str = None) -> bool:
-        """Load the PyTorch YOLO model and class names"""
+    @property
+    def active(self) -> Optional[LoadedModel]:
+        """The primary serving model; requests take one reference and use it throughout"""
+        return self.registry.primary.loaded
+    
+    @active.setter
+    def active(self, loaded: Optional[LoadedModel]):
+        self.registry.primary.loaded = loaded
+    
+    @property
+    def model(self):
+        return self.active.backend if self.active else None
+    
+    @property
+    def class_names(self) -> List[str]:
+        return self.active.class_names if self.active else []
+    
+    @property
+    def model_path(self) -> Optional[str]:
+        return self.active.model_path if self.active else None
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        return self.active.version if self.active else None
+    
+    @property
+    def load_time(self) -> Optional[float]:
+        return self.active.load_time if self.active else None
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.active is not None
+    
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+    
+    def _resolve_model_paths(self, model_path: Optional[str], class_names_path: Optional[str],
+                             entry: Optional[ModelEntry] = None) -> tuple:
+        """Fill in missing paths from the serving model, then env vars, then the repo layout"""
+        if entry is not None and entry is not self.registry.primary:
+            # Registry models reload from their own spec
+            return model_path or entry.model_path, class_names_path or entry.class_names_path
+        
+        if model_path is None:
+            model_path = self.model_path or os.environ.get('YOLO_MODEL_PATH')
+            if not model_path:
+                model_path = os.path.abspath(os.path.join(
+                    os.path.dirname(__file__), 
+                    "..", "..", "ml", "saved_models", "yolo", "yolo_best.pt"
+                ))
+        
+        if class_names_path is None:
+            class_names_path = (self.active.class_names_path if self.active else None) or os.environ.get('CLASS_NAMES_PATH')
+            if not class_names_path:
+                class_names_path = os.path.abspath(os.path.join(
+                    os.path.dirname(__file__), 
+                    "..", "..", "ml", "saved_models", "yolo", "class_names.json"
+                ))
+        return model_path, class_names_path
+    
+    def warmup_sizes(self) -> List[int]:
+        """Input sizes to warm up: MODEL_WARMUP_SIZES, else every size traffic can use"""
+        configured = os.environ.get('MODEL_WARMUP_SIZES')
+        if configured:
+            sizes = [self.normalize_img_size(int(size)) for size in configured.split(',') if size.strip()]
+        else:
+            sizes = [self.img_size]
+            if self.adaptive_resolution:
+                sizes += [self.normalize_img_size(size) for size in self.resolution_levels]
+        return sorted(set(sizes))
+    
+    def _warmup(self, candidate: LoadedModel, runs: Optional[int] = None):
+        """Run dummy inferences so graph init and allocations happen before traffic"""
+        runs = self.warmup_runs if runs is None else runs
+        if runs <= 0:
+            return
+        start_time = time.time()
+        sizes = self.warmup_sizes()
+        for img_size in sizes:
+            dummy = [DecodedImage(np.zeros((img_size, img_size, 3), dtype=np.uint8), (img_size, img_size))]
+            for _ in range(runs):
+                self._infer_batch(dummy, 0.25, img_size, candidate)
+        candidate.warmup_time = time.time() - start_time
+        logger.info(
+            f"🔥 Warmed up {candidate.name} {candidate.version} with {runs} runs at {sizes} "
+            f"in {candidate.warmup_time:.2f}s"
+        )
+    
+    def swap_model(self, model_path: str = None, class_names_path: str = None,
+                   name: Optional[str] = None) -> Dict:
+        """Load and warm up a new model beside the serving one, then swap it in atomically
+        
+        name selects a registry model (default: the primary). In-flight requests finish
+        on the model they started with. On any failure the current model keeps serving
+        and the exception propagates.
+        """
+        entry = self.registry.get(name) if name else self.registry.primary
+        if not self._reload_lock.acquire(blocking=False):
+            raise ModelReloadInProgressError("A model reload is already in progress")
+        
         try:
             start_time = time.time()
-            
-            if model_path is None:
-                model_path = os.environ.get('YOLO_MODEL_PATH')
-                if not model_path:
-                    model_path = os.path.abspath(os.path.join(
-                        os.path.dirname(__file__), 
-                        "..", "..", "ml", "saved_models", "yolo", "yolo_best.pt"
-                    ))
-        
-            if class_names_path is None:
-                class_names_path = os.environ.get('CLASS_NAMES_PATH')
-                if not class_names_path:
-                    class_names_path = os.path.abspath(os.path.join(
-                        os.path.dirname(__file__), 
-                        "..", "..", "ml", "saved_models", "yolo", "class_names.json"
-                    ))
+            model_path, class_names_path = self._resolve_model_paths(model_path, class_names_path, entry)
             
             if not os.path.exists(model_path):
-                logger.error(f"Model file not found: {model_path}")
-                return False
-                
+                raise FileNotFoundError(f"Model file not found: {model_path}")
             if not os.path.exists(class_names_path):
-                logger.error(f"Class names file not found: {class_names_path}")
-                return False
+                raise FileNotFoundError(f"Class names file not found: {class_names_path}")
             
-            # Load YOLO model
-            logger.info(f"Loading YOLO model from {model_path}")
-            self.model = YOLO(model_path)
+            # Load YOLO model on the configured runtime (torch, onnx or openvino)
+            backend_name = entry.backend or self.backend_name
+            logger.info(f"Loading YOLO model '{entry.name}' from {model_path} ({backend_name} backend)")
+            backend = load_backend(model_path, backend_name, self.img_size, entry.precision)
             
             # Load class names
             with open(class_names_path, 'r') as f:
-                self.class_names = json.load(f)
+                class_names = json.load(f)
             
-            self.model_path = model_path
-            self.load_time = time.time() - start_time
-            self.is_loaded = True
+            candidate = LoadedModel(
+                backend, class_names, model_path, class_names_path,
+                version=self._model_version(model_path),
+                generation=self.generation + 1,
+                load_time=time.time() - start_time,
+                name=entry.name
+            )
+            self._warmup(candidate, entry.warmup_runs)
             
-            logger.info(f"✅ YOLO model loaded successfully in {self.load_time:.2f}s")
-            logger.info(f"📊 Classes: {len(self.class_names)}")
-            logger.info(f"🎯 Model task: {self.model.task}")
+            previous = entry.loaded
+            # Single reference assignment: new requests see the new model from here on
+            entry.loaded = candidate
+            entry.load_error = None
+            self.generation = candidate.generation
+            # Cached responses belong to the previous model
+            self.prediction_cache.clear()
             
-            return True
+            reload_info = {
+                "model": entry.name,
+                "version": candidate.version,
+                "previous_version": previous.version if previous else None,
+                "generation": candidate.generation,
+                "load_time": round(candidate.load_time, 3),
+                "warmup_time": round(candidate.warmup_time, 3) if candidate.warmup_time is not None else None,
+                "total_time": round(time.time() - start_time, 3),
+                "completed_at": datetime.now().isoformat()
+            }
+            if entry is self.registry.primary:
+                self.last_reload = reload_info
+            
+            logger.info(f"✅ YOLO model loaded successfully in {candidate.load_time:.2f}s")
+            logger.info(f"📊 Classes: {len(class_names)}")
+            logger.info(f"🎯 Model task: {backend.task}")
+            logger.info(f"⚙️  Backend: {backend.name} ({backend.precision})")
+            logger.info(f"🔁 Serving {entry.name} {candidate.version} (generation {candidate.generation})")
             
+            return reload_info
+        except Exception as e:
+            entry.load_error = str(e)
+            raise
+        finally:
+            self._reload_lock.release()
+    
+    def load_model(self, model_path: str = None, class_names_path: str = None) -> bool:
+        """Load the YOLO model on the configured backend and class names"""
+        try:
+            self.swap_model(model_path, class_names_path)
+            return True
         except Exception as e:
             logger.error(f"❌ Error loading model: {str(e)}")
-            self.is_loaded = False
             return False
     
-    def get_or_create_sentence_builder(self, session_id: str) -> SentenceBuilder:
-        """Get or create a sentence builder for a session"""
-        if session_id not in self.sentence_builders:
-            self.sentence_builders[session_id] = SentenceBuilder()
-        return self.sentence_builders[session_id]
+    def load_registry(self, config_path: Optional[str] = None) -> List[str]:
+        """Register and load the extra models listed in MODEL_REGISTRY_CONFIG
+        
+        A model that fails to load stays registered but unroutable; the rest still load.
+        Returns the names that loaded.
+        """
+        config_path = config_path or os.environ.get('MODEL_REGISTRY_CONFIG')
+        if not config_path:
+            return []
+        
+        loaded = []
+        for entry in read_registry_config(config_path):
+            self.registry.register(entry)
+            try:
+                self.swap_model(name=entry.name)
+                loaded.append(entry.name)
+            except Exception as e:
+                logger.error(f"❌ Error loading registry model '{entry.name}': {str(e)}")
+        logger.info(f"📚 Model registry: {len(loaded)}/{len(self.registry) - 1} extra models loaded")
+        return loaded
     
-    def predict_stream(self, image_data: Union[bytes, Image.Image], 
-                          session_id: str, conf_threshold: float = 0.25) -> Dict:
+    def load_keypoint_model(self, model_path: Optional[str] = None, class_names_path: Optional[str] = None,
+                            model_type: Optional[str] = None) -> bool:
+        """Load the keypoint sequence model from KEYPOINT_MODEL_PATH / KEYPOINT_LABEL_MAP"""
+        model_path = model_path or os.environ.get('KEYPOINT_MODEL_PATH')
+        class_names_path = class_names_path or os.environ.get('KEYPOINT_LABEL_MAP')
+        if not model_path:
+            return False
+        try:
+            if not class_names_path:
+                raise FileNotFoundError("KEYPOINT_LABEL_MAP is not set")
+            self.keypoint_recognizer.load(
+                model_path,
+                class_names_path,
+                model_type or os.environ.get('KEYPOINT_MODEL_TYPE', 'tcn'),
+                int(os.environ.get('KEYPOINT_THREADS', '0')),
+                os.environ.get('KEYPOINT_INCREMENTAL', 'true').lower() == 'true'
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error loading keypoint model: {str(e)}")
+            return False
+    
+    def predict_keypoint_stream(self, frames: List[Optional[np.ndarray]], session_id: str) -> Dict:
+        """Add hand keypoint frames to the session window and feed any recognition to the sentence"""
+        if not self.keypoint_recognizer.is_loaded:
+            raise RuntimeError("Keypoint model not loaded")
+        
+        state = self.get_stream_state(session_id)
+        with self._stats_lock:
+            if state.keypoints is None:
+                state.keypoints = KeypointWindow(self.keypoint_recognizer.window, session_id)
+        
+        recognition = self.keypoint_recognizer.push(state.keypoints, frames)
+        sentence_info = None
+        if recognition is not None:
+            sentence_info = self.sentence_builders.update(
+                session_id,
+                lambda sentence_builder: sentence_builder.add_prediction(recognition)
+            )
+        
+        return {
+            "evaluated": recognition is not None,
+            "recognition": recognition,
+            "frames_seen": state.keypoints.frames_seen,
+            "frames_until_next": max(
+                self.keypoint_recognizer.stride - state.keypoints.frames_since_eval,
+                self.keypoint_recognizer.min_frames - state.keypoints.frames_seen,
+                0
+            ),
+            "sentence_info": sentence_info,
+            "session_id": session_id
+        }
+    
+    def predict_keypoint_frame(self, image_data: Union[bytes, Image.Image, DecodedImage], session_id: str) -> Dict:
+        """Extract hand keypoints from an image frame with MediaPipe, then run the recognizer"""
+        if not self.keypoint_recognizer.is_loaded:
+            raise RuntimeError("Keypoint model not loaded")
+        image = self.preprocess_image(image_data, self.img_size)
+        keypoints = self.keypoint_recognizer.get_extractor().extract(image.pixels)
+        result = self.predict_keypoint_stream([keypoints], session_id)
+        result["hand_detected"] = keypoints is not None
+        return result
+    
+    def _route_session(self, session_id: str, model_name: Optional[str]) -> ModelEntry:
+        """Pick a session's model once (weighted split) and keep it for the rest of the stream"""
+        state = self.get_stream_state(session_id)
+        if model_name is None and state.model_name is not None:
+            try:
+                return self.registry.route(state.model_name)
+            except (UnknownModelError, ModelUnavailableError):
+                pass
+        entry = self.registry.route(model_name)
+        state.model_name = entry.name
+        return entry
+    
+    def get_stream_state(self, session_id: str) -> StreamState:
+        """Get or create the process-local streaming state for a session"""
+        return self.stream_states.get_or_create(session_id, StreamState)
+    
+    @staticmethod
+    def _model_version(model_path: str) -> str:
+        """Identify a model artifact by file name and modification time"""
+        stem = os.path.splitext(os.path.basename(model_path.rstrip(os.sep)))[0]
+        return f"{stem}@{int(os.path.getmtime(model_path))}"
+    
+    def normalize_img_size(self, img_size: Optional[int]) -> int:
+        """Round a requested input size to a multiple of the model stride (32)"""
+        if not img_size:
+            return self.img_size
+        return max(32, int(round(img_size / 32)) * 32)
+    
+    def predict_stream(self, image_data: Union[bytes, Image.Image, DecodedImage], 
+                          session_id: str, conf_threshold: float = 0.25,
+                          img_size: Optional[int] = None,
+                          adaptive_resolution: Optional[bool] = None,
+                          roi_tracking: Optional[bool] = None,
+                          frame_skip: Optional[bool] = None,
+                          model_name: Optional[str] = None) -> Dict:
         """Make prediction and update sentence for continuous capture"""
         if not self.is_loaded:
             raise RuntimeError("Model not loaded")
         
+        entry = self._route_session(session_id, model_name)
+        
         try:
-            # Make regular prediction
-            prediction = self.predict(image_data, conf_threshold)
+            if adaptive_resolution is None:
+                adaptive_resolution = self.adaptive_resolution
+            if roi_tracking is None:
+                roi_tracking = self.roi_tracking
+            if frame_skip is None:
+                frame_skip = self.frame_skip
             
-            # Get sentence builder for this session
-            sentence_builder = self.get_or_create_sentence_builder(session_id)
+            prediction = None
+            skipped = False
+            if frame_skip:
+                start_time = time.time()
+                # ROI crops need full-resolution pixels; everything else can decode reduced
+                image_data = self.preprocess_image(
+                    image_data, None if roi_tracking else self.normalize_img_size(img_size)
+                )
+                thumbnail = self._frame_thumbnail(image_data)
+                prediction = self._reuse_unchanged_frame(thumbnail, session_id, conf_threshold, entry.version)
+                if prediction is not None:
+                    prediction["inference_time"] = round(time.time() - start_time, 4)
+                    skipped = True
             
-            # Update sentence
-            sentence_info = sentence_builder.add_prediction(prediction)
+            if prediction is None:
+                prediction = self._predict_frame(
+                    image_data, session_id, conf_threshold, img_size, adaptive_resolution, roi_tracking,
+                    entry.name
+                )
+                if frame_skip:
+                    self._remember_frame(thumbnail, prediction, session_id, conf_threshold)
+            
+            if skipped and not self.frame_skip_feeds_sentence:
+                sentence_info = self.sentence_builders.update(
+                    session_id,
+                    lambda sentence_builder: sentence_builder.report_prediction(prediction)
+                )
+            else:
+                # Update sentence in a single read-modify-write on the session backend
+                sentence_info = self.sentence_builders.update(
+                    session_id,
+                    lambda sentence_builder: sentence_builder.add_prediction(prediction)
+                )
             
             # Combine prediction with sentence info
             result = {
@@ -201,134 +860,487 @@ class ModelService:
             logger.error(f"Error during continuous prediction: {str(e)}")
             raise
     
+    def _predict_frame(self, image_data: Union[bytes, Image.Image, DecodedImage], session_id: str,
+                       conf_threshold: float, img_size: Optional[int],
+                       adaptive_resolution: bool, roi_tracking: bool,
+                       model_name: Optional[str] = None) -> Dict:
+        """Run the model on a stream frame with the session's resolution and ROI policies"""
+        resolution = None
+        if img_size:
+            # An explicit per-request size always wins
+            resolution_mode = "request"
+        elif adaptive_resolution:
+            resolution_mode = "adaptive"
+            state = self.get_stream_state(session_id)
+            if state.resolution is None:
+                state.resolution = AdaptiveResolution(self.resolution_levels)
+            resolution = state.resolution
+            img_size = resolution.img_size
+        else:
+            resolution_mode = "fixed"
+        
+        if roi_tracking:
+            prediction = self._predict_roi(
+                self.preprocess_image(image_data, None), session_id, conf_threshold, img_size, model_name
+            )
+        else:
+            # Make regular prediction; stream frames carry per-session state, so skip the cache
+            prediction = self.predict(
+                image_data, conf_threshold, img_size, self.stream_max_detections, model_name, use_cache=False
+            )
+        
+        prediction["resolution"] = {
+            "mode": resolution_mode,
+            "img_size": prediction["img_size"]
+        }
+        if resolution is not None:
+            prediction["resolution"]["change"] = resolution.update(prediction["confidence"])
+            prediction["resolution"]["next_img_size"] = resolution.img_size
+        
+        return prediction
+    
+    @staticmethod
+    def _frame_thumbnail(image: DecodedImage) -> np.ndarray:
+        """Tiny grayscale version of a frame for cheap change detection"""
+        thumbnail = cv2.resize(image.pixels, (32, 32), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(thumbnail, cv2.COLOR_RGB2GRAY).astype(np.int16)
+    
+    def _reuse_unchanged_frame(self, thumbnail: np.ndarray, session_id: str,
+                               conf_threshold: float, model_version: Optional[str]) -> Optional[Dict]:
+        """Return the session's last result if this frame barely differs from it"""
+        state = self.get_stream_state(session_id)
+        state.frames_seen += 1
+        
+        if (state.last_prediction is None or state.reference_thumbnail is None
+                or state.last_conf_threshold != conf_threshold
+                or state.last_prediction.get("model_version") != model_version):
+            return None
+        
+        diff = float(np.abs(thumbnail - state.reference_thumbnail).mean())
+        if diff > self.frame_diff_threshold or state.consecutive_skips >= self.frame_max_skip:
+            state.last_diff = diff
+            return None
+        
+        state.consecutive_skips += 1
+        state.frames_skipped += 1
+        with self._stats_lock:
+            self.frames_skipped += 1
+        
+        prediction = dict(state.last_prediction)
+        prediction["frame_skip"] = {
+            "source": "cache",
+            "diff": round(diff, 3),
+            "consecutive_skips": state.consecutive_skips,
+            "skip_rate": round(state.frames_skipped / state.frames_seen, 4)
+        }
+        return prediction
+    
+    def _remember_frame(self, thumbnail: np.ndarray, prediction: Dict, session_id: str,
+                        conf_threshold: float):
+        """Make a freshly inferred frame the reference for later change detection"""
+        state = self.get_stream_state(session_id)
+        state.reference_thumbnail = thumbnail
+        state.last_prediction = prediction
+        state.last_conf_threshold = conf_threshold
+        state.consecutive_skips = 0
+        with self._stats_lock:
+            self.frames_inferred += 1
+        
+        prediction["frame_skip"] = {
+            "source": "model",
+            "diff": round(state.last_diff, 3) if state.last_diff is not None else None,
+            "consecutive_skips": 0,
+            "skip_rate": round(state.frames_skipped / max(1, state.frames_seen), 4)
+        }
+        state.last_diff = None
+    
+    def _roi_crop_box(self, bbox: Dict, image_size: tuple) -> tuple:
+        """Expand the previous bbox into a square crop clamped inside the image"""
+        width, height = image_size
+        side = max(bbox["width"] * self.roi_expand, bbox["height"] * self.roi_expand, self.roi_min_size)
+        side = int(min(side, width, height))
+        cx = (bbox["x1"] + bbox["x2"]) / 2
+        cy = (bbox["y1"] + bbox["y2"]) / 2
+        x1 = int(min(max(cx - side / 2, 0), width - side))
+        y1 = int(min(max(cy - side / 2, 0), height - side))
+        return (x1, y1, x1 + side, y1 + side)
+    
+    def _predict_roi(self, image: DecodedImage, session_id: str, conf_threshold: float,
+                     img_size: Optional[int], model_name: Optional[str] = None) -> Dict:
+        """Detect inside a crop around the last bbox, falling back to the full frame"""
+        state = self.get_stream_state(session_id)
+        img_size = self.normalize_img_size(img_size)
+        
+        prediction = None
+        crop_box = None
+        if state.roi_bbox is not None and state.frames_since_full < self.roi_refresh_frames:
+            crop_box = self._roi_crop_box(state.roi_bbox, image.size)
+            crop = image.crop(crop_box)
+            # The crop is small, so run it at (at most) its own size instead of full img_size
+            roi_img_size = self.normalize_img_size(min(img_size, max(crop.pixel_size)))
+            prediction = self.predict(crop, conf_threshold, roi_img_size, self.stream_max_detections, model_name)
+            
+            if prediction["detections"]:
+                state.frames_since_full += 1
+                mode = "roi"
+                # Map crop coordinates back to the full frame
+                for detection in prediction["detections"]:
+                    bbox = detection["bbox"]
+                    bbox["x1"] += crop_box[0]
+                    bbox["x2"] += crop_box[0]
+                    bbox["y1"] += crop_box[1]
+                    bbox["y2"] += crop_box[1]
+                prediction["image_size"] = {"width": image.size[0], "height": image.size[1]}
+            else:
+                prediction = None
+        
+        if prediction is None:
+            mode = "fallback" if crop_box is not None else "full"
+            prediction = self.predict(image, conf_threshold, img_size, self.stream_max_detections, model_name)
+            state.frames_since_full = 0
+        
+        state.roi_bbox = prediction["bbox"]
+        
+        with self._stats_lock:
+            self.roi_counts[mode] += 1
+        
+        prediction["roi"] = {
+            "mode": mode,
+            "crop": list(crop_box) if mode == "roi" else None
+        }
+        return prediction
+    
     def clear_session_sentence(self, session_id: str) -> Dict:
         """Clear sentence for a specific session"""
-        if session_id in self.sentence_builders:
-            self.sentence_builders[session_id].clear_sentence()
+        def clear(sentence_builder: SentenceBuilder) -> bool:
+            sentence_builder.clear_sentence()
+            return True
+        
+        if self.sentence_builders.update(session_id, clear, create=False):
             return {"success": True, "message": f"Sentence cleared for session {session_id}"}
         return {"success": False, "message": f"Session {session_id} not found"}
     
     def get_session_sentence(self, session_id: str) -> Dict:
         """Get current sentence for a session"""
-        if session_id in self.sentence_builders:
-            return self.sentence_builders[session_id].get_sentence_info()
+        sentence_builder = self.sentence_builders.get(session_id)
+        if sentence_builder is not None:
+            return sentence_builder.get_sentence_info()
         return {"sentence": "", "word_count": 0, "words": []}
     
-    def preprocess_image(self, image_data: Union[bytes, Image.Image]) -> Image.Image:
+    def preprocess_image(self, image_data: Union[bytes, Image.Image, DecodedImage],
+                         img_size: Optional[int] = None) -> DecodedImage:
         """Preprocess image for YOLO inference"""
         try:
-            # Handle different input types
-            if isinstance(image_data, bytes):
-                image = Image.open(io.BytesIO(image_data))
-            elif isinstance(image_data, Image.Image):
-                image = image_data
-            else:
-                raise ValueError("Invalid image data type")
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            return image
+            # JPEGs larger than the model input are decoded at a reduced DCT scale
+            # (img_size=None keeps full resolution)
+            return decode_image(image_data, img_size if self.reduced_decode else None)
             
         except Exception as e:
             logger.error(f"Error preprocessing image: {str(e)}")
             raise
     
-    def predict(self, image_data: Union[bytes, Image.Image], conf_threshold: float = 0.25) -> Dict:
-        """Make prediction on image using YOLO"""
+    def _infer_batch(self, images: List[DecodedImage], conf_threshold: float,
+                     img_size: int, loaded: LoadedModel) -> List[Detections]:
+        """Run a single YOLO forward pass over a list of images"""
+        return loaded.backend.predict([image.pixels for image in images], conf_threshold, img_size)
+    
+    def _format_result(self, result: Detections, image: DecodedImage, conf_threshold: float,
+                       loaded: LoadedModel, max_detections: Optional[int] = None) -> Dict:
+        """Convert backend detections into the detection response format"""
+        # Batched passes run at the lowest threshold in the batch
+        keep = np.flatnonzero(result.conf >= conf_threshold)
+        num_detections = len(keep)
+        
+        if max_detections is not None and len(keep) > max_detections:
+            # Only the top-k ever get sorted and turned into dicts
+            top = np.argpartition(-result.conf[keep], max_detections - 1)[:max_detections]
+            keep = keep[top]
+        keep = keep[np.argsort(-result.conf[keep], kind='stable')]
+        
+        # Boxes come back in decoded pixels; report them in upload coordinates
+        scale_x, scale_y = image.scale
+        xyxy = result.xyxy[keep] * np.array([scale_x, scale_y, scale_x, scale_y], dtype=np.float32)
+        corners = xyxy.astype(np.int64).tolist()
+        sizes = (xyxy[:, 2:] - xyxy[:, :2]).astype(np.int64).tolist()
+        class_names = loaded.class_name_lookup(result.cls[keep]).tolist()
+        confidences = result.conf[keep].tolist()
+        
+        predictions = [
+            {
+                "class": class_name,
+                "confidence": confidence,
+                "bbox": {
+                    "x1": x1,
+                    "y1": y1,
+                    "x2": x2,
+                    "y2": y2,
+                    "width": width,
+                    "height": height
+                }
+            }
+            for class_name, confidence, (x1, y1, x2, y2), (width, height)
+            in zip(class_names, confidences, corners, sizes)
+        ]
+        
+        response = {
+            "detections": predictions,
+            "num_detections": num_detections,
+            "image_size": {
+                "width": image.size[0],
+                "height": image.size[1]
+            },
+            "model_version": loaded.version,
+            "model_name": loaded.name
+        }
+        
+        # Add top prediction for backwards compatibility
+        if predictions:
+            response["predicted_class"] = predictions[0]["class"]
+            response["confidence"] = predictions[0]["confidence"]
+            response["bbox"] = predictions[0]["bbox"]
+        else:
+            response["predicted_class"] = "no_detection"
+            response["confidence"] = 0.0
+            response["bbox"] = None
+        
+        return response
+    
+    def predict(self, image_data: Union[bytes, Image.Image, DecodedImage], conf_threshold: float = 0.25,
+                img_size: Optional[int] = None, max_detections: Optional[int] = None,
+                model_name: Optional[str] = None, use_cache: bool = True) -> Dict:
+        """Make prediction on image using YOLO, keeping at most max_detections boxes
+        
+        model_name picks a registry model; without it traffic is split by model weight.
+        use_cache=False bypasses the prediction cache (streaming frames).
+        """
         if not self.is_loaded:
             raise RuntimeError("Model not loaded")
+        entry = self.registry.route(model_name)
+        # Pin the serving model so a concurrent hot swap can't change it mid-request
+        loaded = entry.loaded
+        if loaded is None:
+            raise ModelUnavailableError(f"Model '{entry.name}' is not loaded")
+        
+        start_time = time.time()
+        img_size = self.normalize_img_size(img_size)
+        
+        cache_key = None
+        if use_cache and self.prediction_cache_enabled and isinstance(image_data, bytes):
+            cache_key = self.prediction_cache.make_key(
+                image_data, conf_threshold, img_size, max_detections, f"{loaded.name}/{loaded.version}"
+            )
+            cached = self.prediction_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "inference_time": round(time.time() - start_time, 4), "cache_hit": True}
         
+        with entry.acquire(self.registry.acquire_timeout):
+            try:
+                with self._stats_lock:
+                    self.img_size_counts[img_size] += 1
+                
+                # Preprocess image
+                image = self.preprocess_image(image_data, img_size)
+                
+                if self.batching_enabled:
+                    # Share a forward pass with other in-flight requests
+                    batched = self.batch_scheduler.submit(image, conf_threshold, img_size, loaded).result()
+                    result = batched["result"]
+                    batch_info = {
+                        "batch_size": batched["batch_size"],
+                        "queue_wait": round(batched["queue_wait"], 4),
+                        "batch_inference_time": round(batched["batch_inference_time"], 4)
+                    }
+                else:
+                    result = self._infer_batch([image], conf_threshold, img_size, loaded)[0]
+                    batch_info = {"batch_size": 1, "queue_wait": 0.0}
+                
+                response = self._format_result(result, image, conf_threshold, loaded, max_detections)
+                
+            except Exception as e:
+                entry.record(time.time() - start_time, error=True)
+                logger.error(f"Error during prediction: {str(e)}")
+                raise
+        
+        entry.record(time.time() - start_time)
+        response["inference_time"] = round(time.time() - start_time, 4)
+        response["img_size"] = img_size
+        response["batch_info"] = batch_info
+        
+        if cache_key is not None:
+            self.prediction_cache.put(cache_key, response)
+            response = {**response, "cache_hit": False}
+        
+        return response
+    
+    def _decode_batch_item(self, image_data: Union[bytes, Image.Image], img_size: int) -> tuple:
+        """Decode one batch item, returning (image, error) instead of raising"""
         try:
+            return self.preprocess_image(image_data, img_size), None
+        except Exception as e:
+            return None, f"Invalid image: {str(e)}"
+    
+    def predict_batch(self, images_data: List[Union[bytes, Image.Image]], conf_threshold: float = 0.25,
+                      img_size: Optional[int] = None, max_detections: Optional[int] = None,
+                      model_name: Optional[str] = None) -> Dict:
+        """Decode images in parallel and run them through the model as batched forward passes"""
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded")
+        entry = self.registry.route(model_name)
+        # Pin the serving model so a concurrent hot swap can't change it mid-request
+        loaded = entry.loaded
+        if loaded is None:
+            raise ModelUnavailableError(f"Model '{entry.name}' is not loaded")
+        
+        with entry.acquire(self.registry.acquire_timeout):
             start_time = time.time()
-            
-            # Preprocess image
-            image = self.preprocess_image(image_data)
-            
-            # Make prediction with YOLO
-            results = self.model.predict(
-                source=image,
-                conf=conf_threshold,
-                verbose=False,
-                imgsz=self.img_size
-            )
-            
-            # Extract results
-            result = results[0]  # First (and only) result
-            
-            predictions = []
-            if result.boxes is not None and len(result.boxes) > 0:
-                for box in result.boxes:
-                    # Extract box data
-                    xyxy = box.xyxy[0].cpu().numpy()  # Bounding box coordinates
-                    conf = float(box.conf[0].cpu().numpy())  # Confidence
-                    cls_idx = int(box.cls[0].cpu().numpy())  # Class index
-                    
-                    # Get class name
-                    class_name = (
-                        self.class_names[cls_idx] 
-                        if cls_idx < len(self.class_names) 
-                        else f"class_{cls_idx}"
+            try:
+                response = self._predict_batch(images_data, conf_threshold, img_size, max_detections, loaded)
+            except Exception:
+                entry.record(time.time() - start_time, error=True)
+                raise
+            entry.record(time.time() - start_time)
+            return response
+    
+    def _predict_batch(self, images_data: List[Union[bytes, Image.Image]], conf_threshold: float,
+                       img_size: Optional[int], max_detections: Optional[int], loaded: LoadedModel) -> Dict:
+        start_time = time.time()
+        img_size = self.normalize_img_size(img_size)
+        
+        # Repeated images are answered from the prediction cache and skip every stage
+        cache_keys, cached = {}, {}
+        if self.prediction_cache_enabled:
+            for index, image_data in enumerate(images_data):
+                if isinstance(image_data, bytes):
+                    cache_keys[index] = self.prediction_cache.make_key(
+                        image_data, conf_threshold, img_size, max_detections, f"{loaded.name}/{loaded.version}"
                     )
-                    
-                    predictions.append({
-                        "class": class_name,
-                        "confidence": conf,
-                        "bbox": {
-                            "x1": int(xyxy[0]),
-                            "y1": int(xyxy[1]), 
-                            "x2": int(xyxy[2]),
-                            "y2": int(xyxy[3]),
-                            "width": int(xyxy[2] - xyxy[0]),
-                            "height": int(xyxy[3] - xyxy[1])
-                        }
-                    })
-            
-            # Sort predictions by confidence
-            predictions.sort(key=lambda x: x["confidence"], reverse=True)
-            
-            inference_time = time.time() - start_time
-            
-            # Prepare response
-            response = {
-                "detections": predictions,
-                "num_detections": len(predictions),
-                "inference_time": round(inference_time, 4),
-                "image_size": {
-                    "width": image.size[0],
-                    "height": image.size[1]
-                }
+                    response = self.prediction_cache.get(cache_keys[index])
+                    if response is not None:
+                        cached[index] = response
+        
+        # Stage 1: decode on the thread pool (PIL releases the GIL while decoding)
+        misses = [index for index in range(len(images_data)) if index not in cached]
+        decoded = dict(zip(misses, self.decode_pool.map(
+            lambda index: self._decode_batch_item(images_data[index], img_size), misses
+        )))
+        errors = {index: error for index, (_, error) in decoded.items() if error}
+        valid = [index for index, (image, _) in decoded.items() if image is not None]
+        decode_done = time.time()
+        
+        # Stage 2: one forward pass per chunk; a failing chunk is retried image by image
+        outputs = {}
+        for chunk_start in range(0, len(valid), self.batch_chunk_size):
+            chunk = valid[chunk_start:chunk_start + self.batch_chunk_size]
+            chunk_start_time = time.time()
+            try:
+                results = self._infer_batch([decoded[index][0] for index in chunk], conf_threshold, img_size, loaded)
+                chunk_results = list(zip(chunk, results))
+            except Exception as e:
+                logger.warning(f"Batch inference failed ({str(e)}), isolating {len(chunk)} images")
+                chunk_results = []
+                for index in chunk:
+                    try:
+                        chunk_results.append(
+                            (index, self._infer_batch([decoded[index][0]], conf_threshold, img_size, loaded)[0])
+                        )
+                    except Exception as item_error:
+                        errors[index] = f"Prediction failed: {str(item_error)}"
+            per_image_time = (time.time() - chunk_start_time) / len(chunk)
+            for index, result in chunk_results:
+                outputs[index] = (result, len(chunk), per_image_time)
+        inference_done = time.time()
+        
+        with self._stats_lock:
+            self.img_size_counts[img_size] += len(valid)
+        
+        # Stage 3: postprocess each image independently
+        items = []
+        for index in range(len(images_data)):
+            if index in cached:
+                items.append({"success": True, "data": {**cached[index], "cache_hit": True}})
+                continue
+            if index in outputs:
+                result, batch_size, per_image_time = outputs[index]
+                try:
+                    response = self._format_result(result, decoded[index][0], conf_threshold, loaded, max_detections)
+                    response["inference_time"] = round(per_image_time, 4)
+                    response["img_size"] = img_size
+                    response["batch_info"] = {"batch_size": batch_size, "queue_wait": 0.0}
+                    if index in cache_keys:
+                        self.prediction_cache.put(cache_keys[index], response)
+                        response = {**response, "cache_hit": False}
+                    items.append({"success": True, "data": response})
+                    continue
+                except Exception as e:
+                    errors[index] = f"Postprocessing failed: {str(e)}"
+            items.append({"success": False, "error": errors[index]})
+        finished = time.time()
+        
+        return {
+            "results": items,
+            "timings": {
+                "decode": round(decode_done - start_time, 4),
+                "inference": round(inference_done - decode_done, 4),
+                "postprocess": round(finished - inference_done, 4),
+                "total": round(finished - start_time, 4)
             }
-            
-            # Add top prediction for backwards compatibility
-            if predictions:
-                response["predicted_class"] = predictions[0]["class"]
-                response["confidence"] = predictions[0]["confidence"]
-                response["bbox"] = predictions[0]["bbox"]
-            else:
-                response["predicted_class"] = "no_detection"
-                response["confidence"] = 0.0
-                response["bbox"] = None
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error during prediction: {str(e)}")
-            raise
+        }
+    
+    @property
+    def model_type(self) -> str:
+        backend = self.model.name if self.model else self.backend_name
+        return {"torch": "YOLOv8 PyTorch", "onnx": "YOLOv8 ONNX Runtime", "openvino": "YOLOv8 OpenVINO"}.get(backend, "YOLOv8")
     
     def get_model_info(self) -> Dict:
         """Get model information"""
         return {
             "is_loaded": self.is_loaded,
             "model_path": self.model_path,
-            "model_type": "YOLOv8 PyTorch",
+            "model_type": self.model_type,
+            "backend": self.model.name if self.model else self.backend_name,
+            "precision": self.model.precision if self.model else None,
             "num_classes": len(self.class_names),
             "class_names": self.class_names,
             "image_size": self.img_size,
+            "frame_skip": {
+                "enabled": self.frame_skip,
+                "diff_threshold": self.frame_diff_threshold,
+                "max_skip": self.frame_max_skip,
+                "feeds_sentence": self.frame_skip_feeds_sentence,
+                "frames_skipped": self.frames_skipped,
+                "frames_inferred": self.frames_inferred,
+                "skip_rate": round(
+                    self.frames_skipped / max(1, self.frames_skipped + self.frames_inferred), 4
+                )
+            },
+            "roi": {
+                "enabled": self.roi_tracking,
+                "refresh_frames": self.roi_refresh_frames,
+                "frames_by_mode": dict(self.roi_counts)
+            },
+            "resolution": {
+                "adaptive_enabled": self.adaptive_resolution,
+                "levels": self.resolution_levels,
+                "frames_by_img_size": {str(k): v for k, v in sorted(self.img_size_counts.items())}
+            },
+            "model_version": self.model_version,
+            "generation": self.generation,
+            "reloading": self.reloading,
+            "last_reload": self.last_reload,
+            "models": self.registry.get_stats(),
+            "prediction_cache": {
+                "enabled": self.prediction_cache_enabled,
+                **self.prediction_cache.get_stats()
+            },
             "load_time": self.load_time,
             "task": self.model.task if self.model else None,
-            "active_sessions": len(self.sentence_builders)
+            "active_sessions": len(self.sentence_builders),
+            "sessions": self.sentence_builders.get_stats(),
+            "batching": {
+                "enabled": self.batching_enabled,
+                **self.batch_scheduler.get_stats()
+            },
+            "keypoint_recognizer": self.keypoint_recognizer.get_stats()
         }
 
 # Global model service instance
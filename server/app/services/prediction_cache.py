@@ -0,0 +1,83 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from ..utils.response_formats import dumps_json
+
+logger = logging.getLogger(__name__)
+
+class PredictionCache:
+    """Content-addressed LRU cache of predict responses, bounded by entries and bytes"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(image_data: bytes, conf_threshold: float, img_size: int,
+                 max_detections: Optional[int], model_version: Optional[str]) -> Tuple:
+        """Cache key: BLAKE2b digest of the image bytes plus everything that shapes the result"""
+        digest = hashlib.blake2b(image_data, digest_size=16).digest()
+        return (digest, round(conf_threshold, 6), img_size, max_detections, model_version)
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, response: Dict):
+        # Serialized size is a close proxy for what the response costs to hold
+        size = len(dumps_json(response)) + 128
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (response, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (called when the model changes)"""
+        with self._lock:
+            if self._entries:
+                logger.info(f"Prediction cache invalidated ({len(self._entries)} entries)")
+            self._entries.clear()
+            self.total_bytes = 0
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
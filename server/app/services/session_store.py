@@ -0,0 +1,492 @@
+import os
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class SessionStore:
+    """In-memory per-session state with idle-TTL and LRU eviction"""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_sessions: int = 1000,
+                 sweep_interval: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        self.sweep_interval = sweep_interval
+        self._sessions = OrderedDict()  # session_id -> (value, last_access)
+        self._lock = threading.RLock()
+        self._eviction_listeners = []
+        self._sweeper = None
+        self._stop_event = threading.Event()
+        self.created = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.deleted = 0
+        self.peak_sessions = 0
+
+    def add_eviction_listener(self, listener: Callable[[str, str], None]):
+        """Register listener(session_id, reason) called when a session is removed"""
+        self._eviction_listeners.append(listener)
+
+    def _notify(self, removed: List):
+        # Called outside the lock so listeners may touch the store
+        for session_id, reason in removed:
+            for listener in self._eviction_listeners:
+                try:
+                    listener(session_id, reason)
+                except Exception as e:
+                    logger.error(f"Session eviction listener failed for {session_id}: {str(e)}")
+
+    def _is_expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - last_access > self.ttl_seconds
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Get a live session value, refreshing its idle timer"""
+        removed = []
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            now = time.time()
+            if self._is_expired(entry[1], now):
+                del self._sessions[session_id]
+                self.evicted_ttl += 1
+                removed.append((session_id, "ttl"))
+                value = None
+            else:
+                value = entry[0]
+                self._sessions[session_id] = (value, now)
+                self._sessions.move_to_end(session_id)
+        self._notify(removed)
+        return value
+
+    def get_or_create(self, session_id: str, factory: Callable[[], Any]) -> Any:
+        """Get a session value, creating it (and evicting LRU sessions) if needed"""
+        value = self.get(session_id)
+        if value is not None:
+            return value
+
+        removed = []
+        with self._lock:
+            # Another thread may have created it between get() and here
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                value = entry[0]
+            else:
+                value = factory()
+                self.created += 1
+                while len(self._sessions) >= self.max_sessions:
+                    evicted_id, _ = self._sessions.popitem(last=False)
+                    self.evicted_lru += 1
+                    removed.append((evicted_id, "lru"))
+            self._sessions[session_id] = (value, time.time())
+            self._sessions.move_to_end(session_id)
+            self.peak_sessions = max(self.peak_sessions, len(self._sessions))
+        self._notify(removed)
+        self._ensure_sweeper()
+        return value
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session explicitly"""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                return False
+            self.deleted += 1
+        self._notify([(session_id, "deleted")])
+        return True
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry is not None and not self._is_expired(entry[1], time.time())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def sweep(self) -> int:
+        """Evict every session idle for longer than the TTL"""
+        if self.ttl_seconds <= 0:
+            return 0
+        removed = []
+        now = time.time()
+        with self._lock:
+            # Entries are kept in access order, so stop at the first live one
+            while self._sessions:
+                session_id, (_, last_access) = next(iter(self._sessions.items()))
+                if not self._is_expired(last_access, now):
+                    break
+                self._sessions.popitem(last=False)
+                self.evicted_ttl += 1
+                removed.append((session_id, "ttl"))
+        self._notify(removed)
+        if removed:
+            logger.info(f"Evicted {len(removed)} idle sessions")
+        return len(removed)
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or self.sweep_interval <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {str(e)}")
+
+    def stop(self):
+        """Stop the background sweeper"""
+        self._stop_event.set()
+
+    def get_stats(self) -> Dict:
+        """Get occupancy and eviction statistics"""
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "peak_sessions": self.peak_sessions,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "created": self.created,
+                "evicted_ttl": self.evicted_ttl,
+                "evicted_lru": self.evicted_lru,
+                "deleted": self.deleted
+            }
+
+class SessionBackend:
+    """Interface for per-session state storage shared by the predict paths
+
+    Implementations hold values of ``state_type``, which must provide a
+    no-argument constructor, ``to_state()`` and a ``from_state()`` classmethod.
+    """
+
+    backend_type = "base"
+
+    def __init__(self, state_type):
+        self.state_type = state_type
+
+    def update(self, session_id: str, fn: Callable[[Any], Any], create: bool = True) -> Any:
+        """Apply fn to the session value in one read-modify-write and return its result
+
+        Returns None without calling fn if the session is missing and create is False.
+        """
+        raise NotImplementedError
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Get a snapshot of the session value, or None if it does not exist"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        raise NotImplementedError
+
+    def add_eviction_listener(self, listener: Callable[[str, str], None]):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict:
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+class _LockedSession:
+    """A session value with its own lock, so updates to different sessions don't contend"""
+
+    __slots__ = ("value", "lock")
+
+    def __init__(self, value):
+        self.value = value
+        self.lock = threading.Lock()
+
+class InMemorySessionBackend(SessionBackend):
+    """Process-local backend; fastest, but state is lost on restart"""
+
+    backend_type = "memory"
+
+    def __init__(self, state_type, ttl_seconds: float = 600.0, max_sessions: int = 1000,
+                 sweep_interval: float = 60.0):
+        super().__init__(state_type)
+        self.store = SessionStore(ttl_seconds, max_sessions, sweep_interval)
+
+    def update(self, session_id: str, fn: Callable[[Any], Any], create: bool = True) -> Any:
+        if create:
+            entry = self.store.get_or_create(session_id, lambda: _LockedSession(self.state_type()))
+        else:
+            entry = self.store.get(session_id)
+            if entry is None:
+                return None
+        # Frames of one session may be inferred on different worker threads
+        with entry.lock:
+            return fn(entry.value)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        entry = self.store.get(session_id)
+        return entry.value if entry is not None else None
+
+    def delete(self, session_id: str) -> bool:
+        return self.store.delete(session_id)
+
+    def add_eviction_listener(self, listener: Callable[[str, str], None]):
+        self.store.add_eviction_listener(listener)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def get_stats(self) -> Dict:
+        return {"backend": self.backend_type, **self.store.get_stats()}
+
+    def stop(self):
+        self.store.stop()
+
+class SQLiteSessionBackend(SessionBackend):
+    """Shared backend on a SQLite file in WAL mode
+
+    Every worker process or replica pointing at the same file sees the same
+    sessions, so no sticky routing is needed. Each update is a single
+    BEGIN IMMEDIATE / SELECT / UPSERT / COMMIT transaction; one that creates a
+    session also evicts the least recently used ones beyond max_sessions.
+    """
+
+    backend_type = "sqlite"
+
+    def __init__(self, state_type, db_path: str, ttl_seconds: float = 600.0,
+                 max_sessions: int = 1000, sweep_interval: float = 60.0):
+        super().__init__(state_type)
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._eviction_listeners = []
+        self._sweeper = None
+        self._stop_event = threading.Event()
+        self.reads = 0
+        self.writes = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.deleted = 0
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions(last_access)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _dumps(value) -> str:
+        return json.dumps(value.to_state(), separators=(",", ":"))
+
+    def _loads(self, state: str):
+        return self.state_type.from_state(json.loads(state))
+
+    def update(self, session_id: str, fn: Callable[[Any], Any], create: bool = True) -> Any:
+        conn = self._connect()
+        now = time.time()
+        expired = False
+        evicted = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT state, last_access FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            inserted = row is None
+            if row is not None and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                # The old session is over; it is removed or replaced by a fresh one below
+                expired = True
+                row = None
+                if not create:
+                    conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            if row is None and not create:
+                conn.execute("COMMIT")
+                if expired:
+                    self._expired(session_id)
+                return None
+
+            value = self._loads(row[0]) if row is not None else self.state_type()
+            result = fn(value)
+            conn.execute(
+                "INSERT INTO sessions (session_id, state, last_access) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET state = excluded.state, "
+                "last_access = excluded.last_access",
+                (session_id, self._dumps(value), now)
+            )
+            if inserted:
+                # Keep max_sessions between sweeps: a new row pushes out the least recently used
+                overflow = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+                if overflow > 0:
+                    evicted = conn.execute(
+                        "SELECT session_id FROM sessions WHERE session_id != ? "
+                        "ORDER BY last_access LIMIT ?", (session_id, overflow)
+                    ).fetchall()
+                    conn.executemany("DELETE FROM sessions WHERE session_id = ?", evicted)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self.reads += 1
+            self.writes += 1
+            self.evicted_lru += len(evicted)
+        if expired:
+            self._expired(session_id)
+        self._notify([(row[0], "lru") for row in evicted])
+        self._ensure_sweeper()
+        return result
+
+    def get(self, session_id: str) -> Optional[Any]:
+        row = self._connect().execute(
+            "SELECT state, last_access FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        with self._lock:
+            self.reads += 1
+        if row is None:
+            return None
+        if self.ttl_seconds > 0 and time.time() - row[1] > self.ttl_seconds:
+            # Only delete the row we saw, not one a concurrent update just refreshed
+            cursor = self._connect().execute(
+                "DELETE FROM sessions WHERE session_id = ? AND last_access = ?", (session_id, row[1])
+            )
+            if cursor.rowcount:
+                self._expired(session_id)
+            return None
+        return self._loads(row[0])
+
+    def delete(self, session_id: str) -> bool:
+        cursor = self._connect().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        if cursor.rowcount == 0:
+            return False
+        with self._lock:
+            self.deleted += 1
+        self._notify([(session_id, "deleted")])
+        return True
+
+    def add_eviction_listener(self, listener: Callable[[str, str], None]):
+        self._eviction_listeners.append(listener)
+
+    def _expired(self, session_id: str):
+        """Count and announce a session found past its TTL on access"""
+        with self._lock:
+            self.evicted_ttl += 1
+        self._notify([(session_id, "ttl")])
+
+    def _notify(self, removed: List):
+        for session_id, reason in removed:
+            for listener in self._eviction_listeners:
+                try:
+                    listener(session_id, reason)
+                except Exception as e:
+                    logger.error(f"Session eviction listener failed for {session_id}: {str(e)}")
+
+    def sweep(self) -> int:
+        """Delete expired sessions, then the oldest ones beyond max_sessions"""
+        conn = self._connect()
+        removed = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.ttl_seconds > 0:
+                cutoff = time.time() - self.ttl_seconds
+                expired = conn.execute(
+                    "SELECT session_id FROM sessions WHERE last_access < ?", (cutoff,)
+                ).fetchall()
+                conn.execute("DELETE FROM sessions WHERE last_access < ?", (cutoff,))
+                removed.extend((row[0], "ttl") for row in expired)
+
+            overflow = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+            if overflow > 0:
+                oldest = conn.execute(
+                    "SELECT session_id FROM sessions ORDER BY last_access LIMIT ?", (overflow,)
+                ).fetchall()
+                conn.executemany("DELETE FROM sessions WHERE session_id = ?", oldest)
+                removed.extend((row[0], "lru") for row in oldest)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self.evicted_ttl += sum(1 for _, reason in removed if reason == "ttl")
+            self.evicted_lru += sum(1 for _, reason in removed if reason == "lru")
+        self._notify(removed)
+        if removed:
+            logger.info(f"Evicted {len(removed)} sessions from {self.db_path}")
+        return len(removed)
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or self.sweep_interval <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {str(e)}")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.backend_type,
+                "db_path": self.db_path,
+                "active_sessions": len(self),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "reads": self.reads,
+                "writes": self.writes,
+                "evicted_ttl": self.evicted_ttl,
+                "evicted_lru": self.evicted_lru,
+                "deleted": self.deleted
+            }
+
+    def stop(self):
+        self._stop_event.set()
+
+def create_session_backend(state_type) -> SessionBackend:
+    """Build the session backend selected by SESSION_BACKEND (memory or sqlite)"""
+    backend = os.environ.get('SESSION_BACKEND', 'memory').lower()
+    ttl_seconds = float(os.environ.get('SESSION_TTL_SECONDS', '600'))
+    max_sessions = int(os.environ.get('SESSION_MAX_COUNT', '1000'))
+    sweep_interval = float(os.environ.get('SESSION_SWEEP_INTERVAL', '60'))
+
+    if backend == 'sqlite':
+        db_path = os.environ.get('SESSION_SQLITE_PATH', 'sessions.db')
+        logger.info(f"Using SQLite session backend at {db_path}")
+        return SQLiteSessionBackend(state_type, db_path, ttl_seconds, max_sessions, sweep_interval)
+
+    if backend != 'memory':
+        logger.warning(f"Unknown SESSION_BACKEND '{backend}', falling back to memory")
+    return InMemorySessionBackend(state_type, ttl_seconds, max_sessions, sweep_interval)
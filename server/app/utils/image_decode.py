@@ -0,0 +1,122 @@
+import io
+import math
+import time
+from typing import Optional, Tuple, Union
+import numpy as np
+from PIL import Image
+
+class DecodedImage:
+    """Contiguous RGB uint8 pixels plus the size of the upload they came from"""
+
+    def __init__(self, pixels: np.ndarray, original_size: Tuple[int, int]):
+        self.pixels = pixels
+        self.original_size = original_size
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) in upload coordinates, like PIL's Image.size"""
+        return self.original_size
+
+    @property
+    def pixel_size(self) -> Tuple[int, int]:
+        """(width, height) of the decoded pixel array"""
+        return self.pixels.shape[1], self.pixels.shape[0]
+
+    @property
+    def scale(self) -> Tuple[float, float]:
+        """Factors mapping pixel coordinates back to upload coordinates"""
+        width, height = self.pixel_size
+        return self.original_size[0] / width, self.original_size[1] / height
+
+    def crop(self, box: Tuple[int, int, int, int]) -> "DecodedImage":
+        """Crop a box given in upload coordinates without copying pixels"""
+        scale_x, scale_y = self.scale
+        x1, y1 = int(box[0] / scale_x), int(box[1] / scale_y)
+        x2, y2 = int(math.ceil(box[2] / scale_x)), int(math.ceil(box[3] / scale_y))
+        return DecodedImage(self.pixels[y1:y2, x1:x2], (box[2] - box[0], box[3] - box[1]))
+
+def draft_size(size: Tuple[int, int], target_size: int) -> Tuple[int, int]:
+    """Smallest size with the aspect ratio of size whose longer side is target_size"""
+    width, height = size
+    ratio = target_size / max(width, height)
+    return int(math.ceil(width * ratio)), int(math.ceil(height * ratio))
+
+def decode_image(image_data: Union[bytes, Image.Image, np.ndarray, DecodedImage],
+                 target_size: Optional[int] = None) -> DecodedImage:
+    """Decode an upload to RGB pixels, letting libjpeg downscale to about target_size"""
+    if isinstance(image_data, DecodedImage):
+        return image_data
+    if isinstance(image_data, np.ndarray):
+        # Raw arrays are taken to be RGB already
+        pixels = np.ascontiguousarray(image_data, dtype=np.uint8)
+        return DecodedImage(pixels, (pixels.shape[1], pixels.shape[0]))
+
+    if isinstance(image_data, bytes):
+        image = Image.open(io.BytesIO(image_data))
+    elif isinstance(image_data, Image.Image):
+        image = image_data
+    else:
+        raise ValueError("Invalid image data type")
+
+    original_size = image.size
+    if target_size and image.format == 'JPEG' and max(original_size) > target_size:
+        # DCT scaling (1/2, 1/4, 1/8) straight to RGB; no-op once the image is loaded
+        image.draft('RGB', draft_size(original_size, target_size))
+
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    return DecodedImage(np.asarray(image), original_size)
+
+def legacy_decode(image_data: bytes) -> np.ndarray:
+    """Full-resolution decode as ModelService did before reduced decoding"""
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.asarray(image)
+
+def benchmark_decode(sizes=((640, 480), (1280, 720), (1920, 1080), (3840, 2160)),
+                     target_size: int = 640, runs: int = 50, quality: int = 90) -> list:
+    """Time full-resolution vs reduced decoding of JPEGs at typical upload sizes"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for width, height in sizes:
+        # Smooth gradient plus noise compresses like a webcam frame
+        gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        pixels = np.clip(gradient + rng.normal(0, 20, (height, width, 3)), 0, 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, 'JPEG', quality=quality)
+        data = buffer.getvalue()
+
+        timings = {}
+        for name, fn in (("legacy", legacy_decode),
+                         ("reduced", lambda d: decode_image(d, target_size).pixels)):
+            fn(data)
+            start = time.perf_counter()
+            for _ in range(runs):
+                shape = fn(data).shape
+            timings[name] = (time.perf_counter() - start) / runs * 1000
+            timings[f"{name}_shape"] = shape
+
+        rows.append({
+            "upload": f"{width}x{height}",
+            "jpeg_kb": round(len(data) / 1024, 1),
+            "legacy_ms": round(timings["legacy"], 2),
+            "reduced_ms": round(timings["reduced"], 2),
+            "speedup": round(timings["legacy"] / timings["reduced"], 2),
+            "decoded": f"{timings['reduced_shape'][1]}x{timings['reduced_shape'][0]}"
+        })
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark reduced-size JPEG decoding")
+    parser.add_argument("--img-size", type=int, default=640)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'upload':>10} {'jpeg_kb':>8} {'legacy_ms':>10} {'reduced_ms':>11} {'speedup':>8} {'decoded':>10}")
+    for row in benchmark_decode(target_size=args.img_size, runs=args.runs):
+        print(f"{row['upload']:>10} {row['jpeg_kb']:>8} {row['legacy_ms']:>10} "
+              f"{row['reduced_ms']:>11} {row['speedup']:>8} {row['decoded']:>10}")
@@ -0,0 +1,208 @@
+import json
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/msgpack"
+MEDIA_PACKED = "application/x-gesturepro-packed"
+
+# Accept values mapped to the format they select
+MEDIA_ALIASES = {
+    MEDIA_JSON: MEDIA_JSON,
+    "application/*": MEDIA_JSON,
+    "*/*": MEDIA_JSON,
+    MEDIA_MSGPACK: MEDIA_MSGPACK,
+    "application/x-msgpack": MEDIA_MSGPACK,
+    "application/vnd.msgpack": MEDIA_MSGPACK,
+    MEDIA_PACKED: MEDIA_PACKED,
+}
+
+# Packed prediction header: version, success, confidence, x1, y1, x2, y2, inference_time,
+# num_detections, img_size. A missing bbox is sent as -1s. It is followed by the
+# length-prefixed UTF-8 strings predicted_class, session_id, sentence, current_word and
+# model_version.
+PACKED_VERSION = 2
+PACKED_HEADER = struct.Struct("<BBf4ifHH")
+PACKED_STRING = struct.Struct("<H")
+
+def dumps_json(content) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def parse_accept(accept: Optional[str]) -> List[Tuple[str, float]]:
+    """Media ranges from an Accept header, highest quality first"""
+    ranges = []
+    for position, part in enumerate((accept or "").split(",")):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        ranges.append((fields[0].lower(), quality, position))
+    ranges.sort(key=lambda r: (-r[1], r[2]))
+    return [(media, quality) for media, quality, _ in ranges]
+
+def select_media_type(accept: Optional[str], packed: bool = False) -> str:
+    """Pick the response format for an Accept header, defaulting to JSON"""
+    for media, quality in parse_accept(accept):
+        selected = MEDIA_ALIASES.get(media)
+        if quality <= 0 or selected is None:
+            continue
+        if selected == MEDIA_MSGPACK and msgpack is None:
+            continue
+        if selected == MEDIA_PACKED and not packed:
+            continue
+        return selected
+    return MEDIA_JSON
+
+def _pack_string(value: Optional[str]) -> bytes:
+    encoded = (value or "").encode("utf-8")[:0xFFFF]
+    return PACKED_STRING.pack(len(encoded)) + encoded
+
+def pack_prediction(content: Dict) -> bytes:
+    """Struct-pack the top prediction of a predict response"""
+    data = content["data"]
+    bbox = data.get("bbox")
+    corners = (bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]) if bbox else (-1, -1, -1, -1)
+    sentence_info = data.get("sentence_info") or {}
+    return b"".join((
+        PACKED_HEADER.pack(
+            PACKED_VERSION,
+            bool(content.get("success", True)),
+            data.get("confidence", 0.0),
+            *corners,
+            data.get("inference_time", 0.0),
+            min(data.get("num_detections", 0), 0xFFFF),
+            data.get("img_size", 0)
+        ),
+        _pack_string(data.get("predicted_class")),
+        _pack_string(data.get("session_id")),
+        _pack_string(sentence_info.get("sentence")),
+        _pack_string(sentence_info.get("current_word")),
+        _pack_string(data.get("model_version"))
+    ))
+
+def unpack_prediction(payload: bytes) -> Dict:
+    """Decode a packed prediction (reference for clients)"""
+    version, success, confidence, x1, y1, x2, y2, inference_time, num_detections, img_size = \
+        PACKED_HEADER.unpack_from(payload)
+    offset = PACKED_HEADER.size
+    strings = []
+    for _ in range(5):
+        (length,) = PACKED_STRING.unpack_from(payload, offset)
+        offset += PACKED_STRING.size
+        strings.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return {
+        "version": version,
+        "success": bool(success),
+        "predicted_class": strings[0],
+        "confidence": confidence,
+        "bbox": None if x1 < 0 else {"x1": x1, "y1": y1, "x2": x2, "y2": y2},
+        "inference_time": inference_time,
+        "num_detections": num_detections,
+        "img_size": img_size,
+        "session_id": strings[1],
+        "sentence": strings[2],
+        "current_word": strings[3],
+        "model_version": strings[4]
+    }
+
+def negotiated_response(content: Dict, accept: Optional[str], packed: bool = False,
+                        status_code: int = 200) -> Response:
+    """Serialize content in the format the client asked for via Accept"""
+    media_type = select_media_type(accept, packed)
+    if media_type == MEDIA_MSGPACK:
+        body = msgpack.packb(content, use_bin_type=True)
+    elif media_type == MEDIA_PACKED:
+        body = pack_prediction(content)
+    else:
+        body = dumps_json(content)
+    headers = {"Vary": "Accept"}
+    data = content.get("data")
+    if isinstance(data, dict) and data.get("model_version"):
+        headers["X-Model-Version"] = data["model_version"]
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
+
+def benchmark_formats(runs: int = 2000) -> List[Dict]:
+    """Compare serialization time and payload size for a typical stream response"""
+    detection = {
+        "class": "hello",
+        "confidence": 0.8734,
+        "bbox": {"x1": 212, "y1": 140, "x2": 398, "y2": 371, "width": 186, "height": 231}
+    }
+    content = {
+        "success": True,
+        "data": {
+            "detections": [detection],
+            "num_detections": 1,
+            "image_size": {"width": 640, "height": 480},
+            "predicted_class": detection["class"],
+            "confidence": detection["confidence"],
+            "bbox": detection["bbox"],
+            "inference_time": 0.0213,
+            "img_size": 640,
+            "batch_info": {"batch_size": 1, "queue_wait": 0.0},
+            "resolution": {"mode": "fixed", "img_size": 640},
+            "sentence_info": {
+                "sentence": "hello my name",
+                "current_word": "is",
+                "word_count": 3,
+                "words": ["hello", "my", "name"],
+                "last_prediction": "is",
+                "stability_count": 2,
+                "is_stable": False
+            },
+            "session_id": "3f2b8c1e-6a3d-4f7e-9d2a-1b5c7e9f0a4d"
+        },
+        "metadata": {"filename": "frame.jpg", "confidence_threshold": 0.25, "img_size": 640}
+    }
+
+    encoders = [("json (stdlib)", lambda c: json.dumps(c).encode("utf-8"))]
+    if orjson is not None:
+        encoders.append(("json (orjson)", dumps_json))
+    if msgpack is not None:
+        encoders.append(("msgpack", lambda c: msgpack.packb(c, use_bin_type=True)))
+    encoders.append(("packed", pack_prediction))
+
+    rows = []
+    for name, encode in encoders:
+        body = encode(content)
+        start = time.perf_counter()
+        for _ in range(runs):
+            encode(content)
+        rows.append({
+            "format": name,
+            "bytes": len(body),
+            "us_per_response": round((time.perf_counter() - start) / runs * 1e6, 2)
+        })
+    return rows
+
+if __name__ == "__main__":
+    print(f"{'format':>14} {'bytes':>7} {'us/response':>12}")
+    for row in benchmark_formats():
+        print(f"{row['format']:>14} {row['bytes']:>7} {row['us_per_response']:>12}")
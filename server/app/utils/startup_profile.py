@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class StartupProfile:
+    """Wall-clock timings of startup phases (imports, database, model load, warmup)
+
+    Phases are always recorded; STARTUP_PROFILE=true also logs the breakdown once the
+    app is ready and writes it to STARTUP_PROFILE_PATH when set.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get('STARTUP_PROFILE', 'false').lower() == 'true'
+        self.output_path = os.environ.get('STARTUP_PROFILE_PATH')
+        self.origin = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.ready_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        """Seconds since this module was first imported"""
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work"""
+        start = self.elapsed()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = self.elapsed()
+            record = {
+                "phase": name,
+                "start": round(start, 4),
+                "duration": round(end - start, 4),
+                "thread": threading.current_thread().name
+            }
+            if error:
+                record["error"] = error
+            with self._lock:
+                self.phases.append(record)
+            if self.enabled:
+                logger.info(f"⏱️  {name}: {end - start:.3f}s")
+
+    def record(self, name: str, duration: float, start: Optional[float] = None):
+        """Add a phase that was timed elsewhere (e.g. inside the model service)"""
+        with self._lock:
+            self.phases.append({
+                "phase": name,
+                "start": round(start if start is not None else self.elapsed() - duration, 4),
+                "duration": round(duration, 4),
+                "thread": threading.current_thread().name
+            })
+        if self.enabled:
+            logger.info(f"⏱️  {name}: {duration:.3f}s")
+
+    def mark_ready(self):
+        """Record the moment the app can take traffic and emit the profile"""
+        if self.ready_at is not None:
+            return
+        self.ready_at = self.elapsed()
+        logger.info(f"🟢 Ready {self.ready_at:.2f}s after first import")
+        if not self.enabled:
+            return
+        for record in sorted(self.phases, key=lambda r: -r["duration"]):
+            logger.info(f"   {record['duration']:8.3f}s  {record['phase']} [{record['thread']}]")
+        if self.output_path:
+            with open(self.output_path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            logger.info(f"Startup profile written to {self.output_path}")
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            "profile_enabled": self.enabled,
+            "ready_after": round(self.ready_at, 4) if self.ready_at is not None else None,
+            "phases": phases
+        }
+
+# Global startup profile
+startup_profile = StartupProfile()
@@ -0,0 +1,9 @@
+from typing import Sequence
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a sample (0.0 for an empty sample)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
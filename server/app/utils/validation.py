@@ -1,5 +1,10 @@
 from fastapi import UploadFile
-from typing import Optional
+from typing import Optional, Tuple
+
+MAX_IMAGE_BYTES = 10 * 1024 * 1024  # 10MB
+
+RAW_IMAGE_CONTENT_TYPES = {'application/octet-stream', 'image/jpeg', 'image/jpg', 'image/png',
+                           'image/webp', 'image/bmp', 'image/gif'}
 
 def validate_image_file(file: UploadFile) -> Optional[str]:
     """
@@ -14,7 +19,7 @@ def validate_image_file(file: UploadFile) -> Optional[str]:
     
     # Check file size (10MB limit)
     if hasattr(file, 'size') and file.size:
-        if file.size > 10 * 1024 * 1024:  # 10MB
+        if file.size > MAX_IMAGE_BYTES:
             return "File size must be less than 10MB"
     
     # Check file extension
@@ -24,4 +29,25 @@ def validate_image_file(file: UploadFile) -> Optional[str]:
         if file_ext not in allowed_extensions:
             return f"File extension {file_ext} not allowed. Allowed: {', '.join(allowed_extensions)}"
     
-    return None
\ No newline at end of file
+    return None
+
+def validate_raw_image_request(content_type: Optional[str],
+                               content_length: Optional[str]) -> Optional[Tuple[int, str]]:
+    """
+    Validate the headers of a raw (non-multipart) image upload
+    
+    Returns:
+        (HTTP status code, error message) if validation fails, None if valid
+    """
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if media_type not in RAW_IMAGE_CONTENT_TYPES:
+        return 400, "Content-Type must be application/octet-stream or an image type"
+    
+    if content_length:
+        try:
+            if int(content_length) > MAX_IMAGE_BYTES:
+                return 413, "File size must be less than 10MB"
+        except ValueError:
+            return 400, "Invalid Content-Length"
+    
+    return None